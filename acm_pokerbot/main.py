@@ -3,6 +3,8 @@ from pokerbot.strategies import example_strat_1, example_strat_2, example_strat_
 import os
 from pokerbot.core import PokerBot
 from pokerbot.strategies import strat_AandY
+from pokerbot.multitable import MultiTableRunner
+import asyncio
 import os
 from dotenv import load_dotenv
 from dotenv import load_dotenv
@@ -21,6 +23,17 @@ def main():
         print("[ERROR] SERVER_IP is not set in your .env file.")
         return
 
+    # TABLES > 1 plays that many tables from this process, one strategy instance each
+    tables = int(os.getenv('TABLES', 1))
+    if tables > 1:
+        runner = MultiTableRunner(ws_url, tables=tables, strategy="strat_AandY", name="Disruptify", team_id="1")
+        try:
+            print(f"[INFO] Starting {tables} PokerBots and connecting to {ws_url}...")
+            asyncio.run(runner.run())
+        except KeyboardInterrupt:
+            print("\n[INFO] Bots stopped by user.")
+        return
+
     # Initialize the bot with the interactive command-line strategy
     bot = PokerBot(strategy=strat_AandY, name="Disruptify", id='1.1')
 
@@ -0,0 +1,198 @@
+"""
+Streaming analysis of hand-history archives (see pokerbot/history.py).
+
+Files are memory-mapped and split into newline-aligned chunks that worker
+processes parse line by line, so memory depends on the chunk size rather
+than on the archive. Each worker returns small aggregates keyed by
+dimension, which are merged into running totals.
+
+Results are written as one CSV per dimension (by_position.csv,
+by_hand_class.csv, by_street.csv, by_style.csv) next to a state.json that
+remembers how far into each file we got. Re-runs only read new files and
+lines appended since the last run.
+
+Usage:
+    python -m pokerbot.analytics history/ --out summary/
+"""
+import argparse
+import csv
+import glob
+import json
+import mmap
+import multiprocessing
+import os
+
+from pokerbot.strategies.strat_AandY import PokerStrategy
+
+CHUNK_SIZE = 8 * 1024 * 1024
+DIMENSIONS = ("position", "hand_class", "street", "style")
+
+# Names for the values returned by PokerStrategy.evaluate_preflop_hand
+HAND_CLASSES = {3: "premium", 2: "strong", 1: "playable", 0: "weak"}
+
+_preflop = PokerStrategy()
+
+
+def plan_chunks(path, start, chunk_size=CHUNK_SIZE):
+    """
+    Split the complete lines of `path` from byte `start` into (path, start, end)
+    chunks of about `chunk_size` bytes. Returns (chunks, end of last full line).
+    """
+    size = os.path.getsize(path)
+    if size <= start:
+        return [], start
+    chunks = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Stop at the last newline so a line still being written is left for next time
+        last = mm.rfind(b"\n", start, size)
+        if last == -1:
+            return [], start
+        final = last + 1
+        while start < final:
+            end = min(start + chunk_size, final)
+            if end < final:
+                end = mm.find(b"\n", end - 1, final) + 1
+            chunks.append((path, start, end))
+            start = end
+    return chunks, final
+
+
+def _empty():
+    return {dimension: {} for dimension in DIMENSIONS}
+
+
+def _add(totals, dimension, value, won, net):
+    row = totals[dimension].setdefault(str(value), [0, 0, 0, 0])  # hands, wins, net, hands with net
+    row[0] += 1
+    row[1] += 1 if won else 0
+    if net is not None:
+        row[2] += net
+        row[3] += 1
+
+
+def process_chunk(task):
+    """Aggregate one chunk of a history file. Runs inside worker processes."""
+    path, start, end = task
+    totals = _empty()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            newline = mm.find(b"\n", pos, end)
+            if newline == -1:
+                newline = end
+            line = mm[pos:newline]
+            pos = newline + 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+
+            won = record.get("won", False)
+            net = record.get("net")
+            hole = record.get("hole")
+            # Hands we never acted in have no hole cards to classify
+            hand_class = HAND_CLASSES[_preflop.evaluate_preflop_hand(hole)] if hole else "unknown"
+            _add(totals, "position", record.get("position"), won, net)
+            _add(totals, "hand_class", hand_class, won, net)
+            _add(totals, "street", record.get("street"), won, net)
+            _add(totals, "style", record.get("style"), won, net)
+    return totals
+
+
+def merge(totals, other):
+    for dimension, rows in other.items():
+        for value, row in rows.items():
+            current = totals[dimension].setdefault(value, [0, 0, 0, 0])
+            for i, amount in enumerate(row):
+                current[i] += amount
+    return totals
+
+
+def load_state(out_dir):
+    path = os.path.join(out_dir, "state.json")
+    if not os.path.exists(path):
+        return {"files": {}, "totals": _empty()}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(out_dir, state):
+    path = os.path.join(out_dir, "state.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def write_tables(out_dir, totals):
+    for dimension, rows in totals.items():
+        with open(os.path.join(out_dir, f"by_{dimension}.csv"), "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([dimension, "hands", "wins", "win_rate", "net", "avg_net"])
+            for value, (hands, wins, net, net_hands) in sorted(rows.items(), key=lambda kv: -kv[1][0]):
+                avg_net = f"{net / net_hands:.2f}" if net_hands else ""
+                writer.writerow([value, hands, wins, f"{wins / hands:.4f}", net, avg_net])
+
+
+def analyze(archive, out_dir, processes=None, chunk_size=CHUNK_SIZE):
+    """
+    Fold every new line under `archive` into the totals kept in `out_dir`
+    and rewrite the summary tables. Returns the updated totals.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    state = load_state(out_dir)
+    paths = sorted(glob.glob(os.path.join(archive, "**", "*.jsonl"), recursive=True))
+
+    tasks = []
+    offsets = {}
+    for path in paths:
+        key = os.path.abspath(path)
+        start = state["files"].get(key, 0)
+        if os.path.getsize(path) < start:
+            print(f"[WARN] {path} shrank since the last run; skipping it")
+            continue
+        chunks, end = plan_chunks(path, start, chunk_size)
+        tasks.extend(chunks)
+        offsets[key] = end
+
+    if not tasks:
+        print("[INFO] No new hands since the last run.")
+        return state["totals"]
+
+    size = sum(end - start for _, start, end in tasks)
+    print(f"[INFO] Processing {size / 1e6:.1f} MB in {len(tasks)} chunks...")
+    processes = processes or multiprocessing.cpu_count()
+    totals = state["totals"]
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.imap_unordered(process_chunk, tasks):
+                merge(totals, result)
+    else:
+        for task in tasks:
+            merge(totals, process_chunk(task))
+
+    state["files"].update(offsets)
+    save_state(out_dir, state)
+    write_tables(out_dir, totals)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize hand-history archives.")
+    parser.add_argument("archive", help="Directory holding *.jsonl hand histories")
+    parser.add_argument("--out", default="summary", help="Where summary tables and state go")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-mb", type=float, default=CHUNK_SIZE / 1024 / 1024)
+    args = parser.parse_args()
+
+    totals = analyze(args.archive, args.out, processes=args.processes,
+                     chunk_size=int(args.chunk_mb * 1024 * 1024))
+    for dimension in DIMENSIONS:
+        print(f"\n=== Win rate by {dimension} ===")
+        for value, (hands, wins, _, _) in sorted(totals[dimension].items(), key=lambda kv: -kv[1][0]):
+            print(f"  {value:<20} {hands:>8} hands  {wins / hands:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
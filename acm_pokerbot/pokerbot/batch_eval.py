@@ -0,0 +1,132 @@
+"""
+Vectorized hand ranking with NumPy.
+
+Cards are ints 0-51 (rank * 4 + suit, rank 0 = "2" ... 12 = "A"), so many
+hands can be ranked in one call instead of looping over rank_hand(). The
+scores order hands exactly like evaluator.rank_hand(): a bigger score wins.
+"""
+import numpy as np
+
+from pokerbot.evaluator import VALUE_MAP
+
+# The server sends suit glyphs; letter and name spellings map to the same four slots
+_SUIT_INDEX = {
+    spelling: slot
+    for slot, names in enumerate([("♣", "c", "clubs"), ("♦", "d", "diamonds"), ("♥", "h", "hearts"), ("♠", "s", "spades")])
+    for name in names
+    for spelling in (name, name.upper(), name.capitalize())
+}
+
+def _build_tables():
+    """
+    Lookup tables indexed by a 13-bit rank mask (bit r set = rank r present):
+    highest rank, number of ranks, best straight (-1 if none) and the top five
+    ranks packed as 4-bit fields from bit 16 down.
+    """
+    size = 1 << 13
+    high = np.zeros(size, dtype=np.int64)
+    popcount = np.zeros(size, dtype=np.int64)
+    straight = np.full(size, -1, dtype=np.int64)
+    top5 = np.zeros(size, dtype=np.int64)
+    windows = [(top, sum(1 << r for r in range(top - 4, top + 1))) for top in range(12, 3, -1)]
+    windows.append((3, (1 << 12) | 0b1111))  # Ace-low A-2-3-4-5
+    for bits in range(1, size):
+        ranks = [r for r in range(12, -1, -1) if bits >> r & 1]
+        high[bits] = ranks[0]
+        popcount[bits] = len(ranks)
+        for i, r in enumerate(ranks[:5]):
+            top5[bits] |= r << (16 - 4 * i)
+        for top, mask in windows:
+            if bits & mask == mask:
+                straight[bits] = top
+                break
+    return high, popcount, straight, top5
+
+
+_HIGH, _POPCOUNT, _STRAIGHT, _TOP5 = _build_tables()
+
+# Per-card rows summed over a hand: rank counts, and per-suit rank masks
+_RANK_ONEHOT = np.zeros((52, 13), dtype=np.int8)
+_SUIT_BITS = np.zeros((52, 4), dtype=np.int64)
+for _card in range(52):
+    _RANK_ONEHOT[_card, _card // 4] = 1
+    _SUIT_BITS[_card, _card % 4] = 1 << (_card // 4)
+_RANK_WEIGHTS = 1 << np.arange(13)
+
+
+def card_index(card):
+    """Int 0-51 for a server card dict. Raises ValueError for a suit it doesn't know."""
+    suit = _SUIT_INDEX.get(card['_suit'])
+    if suit is None:
+        raise ValueError(f"Unknown card suit {card['_suit']!r}")
+    return (VALUE_MAP[card['_rank']] - 2) * 4 + suit
+
+
+def card_indices(cards):
+    return [card_index(card) for card in cards]
+
+
+def rank_batch(cards):
+    """
+    Score an (N, 5-7) array of card ints. Returns an (N,) int array laid out as
+    category << 20 | up to five 4-bit tiebreak ranks (categories as in HAND_CATEGORIES).
+    """
+    return rank_parts(*hand_parts(cards))
+
+
+def hand_parts(cards):
+    """
+    Per-row rank counts (N, 13) and per-suit rank masks (N, 4) for an (N, k)
+    array of card ints. Parts of disjoint card sets add up, so a shared board
+    can be summed once and added to every holding.
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    counts = np.zeros((len(cards), 13), dtype=np.int64)
+    suit_bits = np.zeros((len(cards), 4), dtype=np.int64)
+    # Column by column is about twice as fast as summing over the card axis
+    for column in cards.T:
+        counts += _RANK_ONEHOT[column]
+        suit_bits += _SUIT_BITS[column]
+    return counts, suit_bits
+
+
+def rank_parts(counts, suit_bits):
+    """rank_batch() for hands already reduced by hand_parts()."""
+    ranks = (counts > 0) @ _RANK_WEIGHTS
+    pairs = (counts == 2) @ _RANK_WEIGHTS
+    trips = (counts == 3) @ _RANK_WEIGHTS
+    quads = (counts == 4) @ _RANK_WEIGHTS
+
+    # At most one suit can hold 5+ of 7 cards; every other suit is zeroed out
+    flush_bits = np.where(_POPCOUNT[suit_bits] >= 5, suit_bits, 0).max(axis=1)
+
+    high_trip = _HIGH[trips]
+    high_pair = _HIGH[pairs]
+    second_pair = _HIGH[pairs & ~(1 << high_pair)]
+    trip_bit = np.where(trips > 0, 1 << high_trip, 0)
+
+    score = _TOP5[ranks]
+    score = np.where(pairs > 0, (1 << 20) | (high_pair << 16) | ((_TOP5[ranks & ~(1 << high_pair)] >> 4) & 0xFFF0), score)
+    two_pair_rest = ranks & ~(1 << high_pair) & ~(1 << second_pair)
+    score = np.where(_POPCOUNT[pairs] >= 2,
+                     (2 << 20) | (high_pair << 16) | (second_pair << 12) | ((_TOP5[two_pair_rest] >> 8) & 0xF00), score)
+    score = np.where(trips > 0, (3 << 20) | (high_trip << 16) | ((_TOP5[ranks & ~trip_bit] >> 4) & 0xFF00), score)
+    score = np.where(_STRAIGHT[ranks] >= 0, (4 << 20) | (_STRAIGHT[ranks] << 16), score)
+    score = np.where(flush_bits > 0, (5 << 20) | _TOP5[flush_bits], score)
+    full_house_pair = _HIGH[(trips & ~trip_bit) | pairs]
+    score = np.where((trips > 0) & (((trips & ~trip_bit) | pairs) > 0),
+                     (6 << 20) | (high_trip << 16) | (full_house_pair << 12), score)
+    high_quad = _HIGH[quads]
+    score = np.where(quads > 0, (7 << 20) | (high_quad << 16) | (_HIGH[ranks & ~(1 << high_quad)] << 12), score)
+    score = np.where(_STRAIGHT[flush_bits] >= 0, (8 << 20) | (_STRAIGHT[flush_bits] << 16), score)
+    return score
+
+
+def sample_deals(rng, exclude, rows, count):
+    """
+    Draw `count` distinct cards per row from the deck minus `exclude`.
+    Returns an (rows, count) int array.
+    """
+    deck = np.setdiff1d(np.arange(52), np.asarray(exclude, dtype=np.int64))
+    order = rng.random((rows, deck.size)).argsort(axis=1)[:, :count]
+    return deck[order]
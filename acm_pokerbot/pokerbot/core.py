@@ -3,13 +3,16 @@ import json
 import uuid
 import os
 from dotenv import load_dotenv
+from pokerbot import history, profiling
+from pokerbot.table_model import TableModel
 
 
 class PokerBot:
-    def __init__(self, strategy, name, id):
+    def __init__(self, strategy, name, id, table_id=None):
         """
         :param strategy: A module or object with a method `strat_action(game_state)`
                          that returns a dictionary {"action": <str>, "amount": <int>}.
+        :param table_id: Optional table to ask for when joining (see pokerbot/multitable.py).
         """
         load_dotenv()
         self.strategy = strategy
@@ -17,20 +20,27 @@ class PokerBot:
         # Environment variables
         self.server_ip = os.getenv("SERVER_IP")
         self.port = os.getenv("PORT", 3002)
+        self.profiler = profiling.from_env()  # None unless POKERBOT_PROFILE is set
+        self.history = history.from_env(table_id, player=id)  # None unless POKERBOT_HISTORY is set
 
         self.ws = None
         self.player_id = id
         self.name = name
+        self.table_id = table_id
         self.buy_in = 1000
 
         self.community_cards = []
         self.pot = 0
         self.current_bet = 0
+        self.players = []
+        self.table = TableModel(id, name)  # Seats, button and stacks, kept up to date from gameState
 
     def on_message(self, ws, message):
         """Handles incoming messages from the WebSocket server."""
-        data = json.loads(message)
+        self.handle_message(json.loads(message))
 
+    def handle_message(self, data):
+        """Dispatch one decoded server message."""
         msg_type = data.get("type", "")
 
         if msg_type == "gameState":
@@ -51,6 +61,8 @@ class PokerBot:
         self.community_cards = state.get("communityCards", [])
         self.pot = state.get("pot", 0)
         self.current_bet = state.get("currentBet", 0)
+        self.players = state.get("players", [])
+        self.table.update(state)
 
 
         # print("\n=== Table Info ===")
@@ -94,22 +106,40 @@ class PokerBot:
             "availableActions": available_actions,
             "minRaise": state.get("minRaise", 0),
             "maxBet": state.get("maxBet", 0),
+            "players": self.players,
         }
+        # position, activeOpponents, effectiveStack, playersInHand, ownBet
+        self.table.identify_actor()
+        game_state.update(self.table.fields(stack=game_state["stackSize"]))
         # print(f"GAMESTATE: {game_state}\n\n")
-        move = self.strategy.strat_action(game_state)
-        action = move.get("action", "fold")
-        amount = move.get("amount", 0)
-
-        # Send the chosen action back to the server
-        self.send_action(action, amount)
+        profile = self.profiler.begin(game_state) if self.profiler is not None else None
+        try:
+            move = self.strategy.strat_action(game_state)
+            action = move.get("action", "fold")
+            amount = move.get("amount", 0)
+
+            # Send the chosen action back to the server
+            self.send_action(action, amount)
+        finally:
+            # Always stop the sampler / profile hook, even if the strategy raised
+            if profile is not None:
+                self.profiler.end(profile)
+        if self.history is not None:
+            self.history.record_decision(game_state, move, self.strategy)
 
     def handle_hand_complete(self, data):
         """Displays hand results."""
         winners = data.get("winners", [])
-        if any(winner['playerId'] == self.player_id for winner in winners):
+        won = any(winner['playerId'] == self.player_id for winner in winners)
+        winnings = sum(winner.get("amount", 0) for winner in winners if winner['playerId'] == self.player_id)
+        if won:
             print("\n🎉 YOU WON THE HAND! 🎉")
         else:
             print("\n😢 YOU LOST THE HAND 😢")
+        if self.history is not None:
+            self.history.finish_hand(won, net=self.table.net(winnings), dealt_in=self.table.dealt_in(),
+                                     board=self.community_cards, position=self.table.position())
+        self.table.finish_hand(winnings)
 
     def handle_players(self, data):
         """Displays a simple list of all players in the room."""
@@ -153,6 +183,8 @@ class PokerBot:
             "name": self.name,
             "buyIn": self.buy_in
         }
+        if self.table_id is not None:
+            join_msg["tableId"] = self.table_id
         self.ws.send(json.dumps(join_msg))
 
     def send_action(self, action, amount=0):
@@ -0,0 +1,318 @@
+import contextlib
+import importlib
+import io
+import random
+
+from pokerbot.evaluator import rank_hand
+from pokerbot.table_model import seat_position
+
+# Table-model fields (see pokerbot/table_model.py) added to every game_state;
+# on a server, PokerBot derives these from gameState rather than receiving them
+TABLE_FIELDS = ("position", "activeOpponents", "effectiveStack", "playersInHand", "ownBet")
+
+RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
+SUITS = ["♣", "♦", "♥", "♠"]
+
+
+def make_deck():
+    """Return a fresh 52-card deck using the same card dicts the server sends."""
+    return [{"_rank": rank, "_suit": suit} for suit in SUITS for rank in RANKS]
+
+
+def shuffled_deck(seed):
+    """
+    Return the deck shuffled with a dedicated RNG.
+    The same seed always gives the same card order, which is what lets us
+    replay identical deals for different strategies (common random numbers).
+    """
+    deck = make_deck()
+    random.Random(seed).shuffle(deck)
+    return deck
+
+
+def load_strategy(name, params=None, seed=None):
+    """
+    Build a strategy object from a module name in pokerbot/strategies.
+    Modules that define a PokerStrategy class get a fresh instance (so every
+    seat has its own state); plain function modules are returned as-is.
+    """
+    module = importlib.import_module(f"pokerbot.strategies.{name}")
+    if hasattr(module, "PokerStrategy"):
+        return module.PokerStrategy(params=params, seed=seed)
+    return module
+
+
+def reseed(strategy, seed):
+    """Reset a strategy's RNG (if it has one) so decisions are replayable."""
+    rng = getattr(strategy, "rng", None)
+    if rng is not None:
+        rng.seed(seed)
+
+
+def play_duplicate(hero, opponents, seed, starting_stack=1000, big_blind=10):
+    """
+    Play one seeded deal once per seat, rotating `hero` through every seat
+    while the cards, button and everyone's RNG seeds stay the same.
+    :param hero: (module name, params) for the strategy being measured.
+    :param opponents: Strategy module names for the other seats.
+    Returns a list of (hero seat, hand result) for each rotation.
+    """
+    name, params = hero
+    n = len(opponents) + 1
+    deck = shuffled_deck(seed)
+    rotations = []
+    for seat in range(n):
+        strategies = [load_strategy(opponent) for opponent in opponents]
+        strategies.insert(seat, load_strategy(name, params=params))
+        for i, strategy in enumerate(strategies):
+            # Seed by role (hero = 0, opponents 1..), not seat, so each
+            # player's own randomness follows it around the table
+            role = 0 if i == seat else (i + 1 if i < seat else i)
+            reseed(strategy, seed * 31 + role)
+        table = HeadlessTable(strategies, starting_stack=starting_stack, big_blind=big_blind,
+                              small_blind=big_blind // 2)
+        rotations.append((seat, table.play_hand(deck, button=seed % n, seed=seed)))
+    return rotations
+
+
+class HeadlessTable:
+    """
+    A minimal no-limit hold'em dealer that runs strategies without a server.
+    Every hand starts from the same stacks, so hands are independent samples.
+    Bet and raise amounts are "raise to" totals for the round, matching
+    minRaise/maxBet in the privateState message.
+
+    The rules live in `hand_steps`, a generator that pauses whenever a seat
+    has to act, so the local table server (pokerbot/server.py) can drive the
+    same hands over WebSockets.
+    """
+
+    def __init__(self, strategies, starting_stack=1000, small_blind=5, big_blind=10, quiet=True):
+        """
+        :param strategies: One strategy per seat (module or object with `strat_action`).
+        :param quiet: Swallow anything strategies print while playing.
+        """
+        self.strategies = list(strategies)
+        self.starting_stack = starting_stack
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.quiet = quiet
+
+    def play_hand(self, deck, button=0, seed=None):
+        """
+        Play one hand from a fixed deck order.
+        :param deck: Card order to deal from (see shuffled_deck).
+        :param button: Seat index of the dealer button.
+        :param seed: Seeds the global RNG for strategies that use `random` directly.
+        Returns a dict with each seat's chip result ("net") and misact counts.
+        """
+        if seed is not None:
+            random.seed(seed)
+        if not self.quiet:
+            return self._play_hand(deck, button)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self._play_hand(deck, button)
+
+    def _play_hand(self, deck, button):
+        steps = self.hand_steps(deck, button, [self.starting_stack] * len(self.strategies))
+        try:
+            step = next(steps)
+            while True:
+                kind, seat, game_state, _ = step
+                if kind == "act":
+                    try:
+                        move = self.strategies[seat].strat_action(game_state)
+                    except Exception:
+                        move = None
+                    step = steps.send(move)
+                else:
+                    step = next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+    def hand_steps(self, deck, button, stacks):
+        """
+        Generator that plays one hand with the given starting stacks.
+        Yields (kind, seat, game_state, hand) tuples:
+          ("update", None, None, hand) whenever the table changes, and
+          ("act", seat, game_state, hand) when `seat` must act; send back the
+          strategy's move dict (or None if it timed out / crashed).
+        Returns the hand result (see play_hand) via StopIteration.
+        """
+        n = len(stacks)
+        cards = iter(deck)
+        hand = {
+            "stacks": list(stacks),
+            "committed": [0] * n,
+            "bets": [0] * n,
+            "folded": [False] * n,
+            "hole": [[next(cards), next(cards)] for _ in range(n)],
+            "board": [],
+            "misacts": [0] * n,
+            "chance": [],
+            "button": button,
+            "current_bet": 0,
+            "actor": None,
+        }
+
+        # Heads-up the button posts the small blind and acts first pre-flop
+        if n == 2:
+            sb_seat, bb_seat = button, (button + 1) % n
+        else:
+            sb_seat, bb_seat = (button + 1) % n, (button + 2) % n
+        self._post(hand, sb_seat, self.small_blind)
+        self._post(hand, bb_seat, self.big_blind)
+        yield ("update", None, None, hand)
+
+        streets = [(0, (bb_seat + 1) % n), (3, (button + 1) % n), (1, (button + 1) % n), (1, (button + 1) % n)]
+        for deal, first in streets:
+            if deal:
+                self._deal_board(hand, cards, deal)
+                hand["bets"] = [0] * n
+                yield ("update", None, None, hand)
+            if self._live_count(hand) > 1 and self._actor_count(hand) > 1:
+                yield from self._betting_round(hand, first)
+            if self._live_count(hand) == 1:
+                break
+
+        # Run out the board if everyone left is all-in
+        while self._live_count(hand) > 1 and len(hand["board"]) < 5:
+            self._deal_board(hand, cards, 3 if not hand["board"] else 1)
+            yield ("update", None, None, hand)
+
+        winnings = self._award(hand)
+        net = [winnings[i] - hand["committed"][i] for i in range(n)]
+        return {"net": net, "misacts": hand["misacts"], "board": hand["board"], "hole": hand["hole"],
+                "chance": hand["chance"], "winnings": winnings,
+                "stacks": [hand["stacks"][i] + winnings[i] for i in range(n)]}
+
+    def _deal_board(self, hand, cards, count):
+        """Deal community cards, recording who was live and what was in the pot beforehand."""
+        hand["chance"].append({
+            "board": list(hand["board"]),
+            "live": [i for i, folded in enumerate(hand["folded"]) if not folded],
+            "pot": sum(hand["committed"]),
+        })
+        hand["current_bet"] = 0
+        for _ in range(count):
+            hand["board"].append(next(cards))
+
+    def _post(self, hand, seat, amount):
+        amount = min(amount, hand["stacks"][seat])
+        hand["stacks"][seat] -= amount
+        hand["bets"][seat] += amount
+        hand["committed"][seat] += amount
+
+    def _live_count(self, hand):
+        return sum(1 for folded in hand["folded"] if not folded)
+
+    def _actor_count(self, hand):
+        """Players who can still put chips in (not folded, not all-in)."""
+        return sum(1 for i, folded in enumerate(hand["folded"]) if not folded and hand["stacks"][i] > 0)
+
+    def _betting_round(self, hand, first):
+        n = len(hand["stacks"])
+        current_bet = max(hand["bets"])
+        last_raise = self.big_blind
+        pending = {i for i in range(n) if not hand["folded"][i] and hand["stacks"][i] > 0}
+        seat = first
+        while pending and self._live_count(hand) > 1:
+            if seat not in pending:
+                seat = (seat + 1) % n
+                continue
+            pending.discard(seat)
+            to_call = current_bet - hand["bets"][seat]
+            # Nobody left to respond to a raise; just close the action
+            if to_call == 0 and self._actor_count(hand) == 1:
+                break
+
+            max_bet = hand["bets"][seat] + hand["stacks"][seat]
+            min_raise = min(current_bet + last_raise, max_bet)
+            if to_call > 0:
+                available = ["fold", "call"]
+                if max_bet > current_bet:
+                    available.append("raise")
+            elif current_bet == 0:
+                available = ["check", "bet"]
+            else:
+                available = ["check", "raise"]
+
+            game_state = {
+                "holeCards": hand["hole"][seat],
+                "communityCards": list(hand["board"]),
+                "pot": sum(hand["committed"]),
+                "stackSize": hand["stacks"][seat],
+                "currentBet": current_bet,
+                "availableActions": available,
+                "minRaise": min_raise,
+                "maxBet": max_bet,
+            }
+            opponents = [i for i in range(n) if i != seat and not hand["folded"][i]]
+            game_state.update({
+                "position": seat_position(seat, hand["button"], n),
+                "activeOpponents": len(opponents),
+                "effectiveStack": min(hand["stacks"][seat], max(hand["stacks"][i] for i in opponents)),
+                "playersInHand": n,
+                "ownBet": hand["bets"][seat],
+            })
+            hand["current_bet"] = current_bet
+            hand["actor"] = seat
+            move = yield ("act", seat, game_state, hand)
+            hand["actor"] = None
+            action, amount = self._legal_move(hand, seat, move, available)
+
+            if action == "fold":
+                hand["folded"][seat] = True
+            elif action == "call":
+                self._post(hand, seat, to_call)
+            elif action in ("bet", "raise"):
+                amount = max(min_raise, min(int(amount), max_bet))
+                self._post(hand, seat, amount - hand["bets"][seat])
+                if amount > current_bet:
+                    last_raise = max(last_raise, amount - current_bet)
+                    current_bet = amount
+                    hand["current_bet"] = current_bet
+                    pending = {i for i in range(n) if i != seat and not hand["folded"][i] and hand["stacks"][i] > 0}
+            yield ("update", None, None, hand)
+            seat = (seat + 1) % n
+
+    def _legal_move(self, hand, seat, move, available):
+        """
+        Turn a move dict into a legal (action, amount); illegal moves count as misacts.
+        No move at all (None: timed out or disconnected) checks or folds without one.
+        """
+        try:
+            action = move.get("action", "fold")
+            amount = move.get("amount", 0) or 0
+            int(amount)
+        except (AttributeError, TypeError, ValueError):
+            action, amount = None, 0
+        if action not in available:
+            if move is not None:
+                hand["misacts"][seat] += 1
+            action = "check" if "check" in available else "fold"
+        return action, amount
+
+    def _award(self, hand):
+        """Split the pot (and any side pots) between the best live hands."""
+        n = len(hand["stacks"])
+        winnings = [0] * n
+        committed = hand["committed"]
+        live = [i for i in range(n) if not hand["folded"][i]]
+        if len(live) == 1:
+            winnings[live[0]] = sum(committed)
+            return winnings
+
+        scores = {i: rank_hand(hand["hole"][i] + hand["board"]) for i in live}
+        previous = 0
+        for level in sorted(set(committed[i] for i in live)):
+            pot = sum(min(c, level) - min(c, previous) for c in committed)
+            contenders = [i for i in live if committed[i] >= level]
+            best = max(scores[i] for i in contenders)
+            winners = [i for i in contenders if scores[i] == best]
+            share, odd = divmod(pot, len(winners))
+            for i in winners:
+                winnings[i] += share
+            winnings[winners[0]] += odd
+            previous = level
+        return winnings
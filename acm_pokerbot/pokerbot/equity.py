@@ -0,0 +1,53 @@
+"""
+Showdown equity of hands whose hole cards are all known (used by the luck
+adjustment in pokerbot/evaluation.py).
+
+Every runout is scored in one NumPy batch with the tables in
+pokerbot/batch_eval.py. With two or fewer cards to come (flop and turn) all
+runouts are enumerated, so those equities are exact; pre-flop a random
+sample of boards is used.
+"""
+import itertools
+
+import numpy as np
+
+from pokerbot.batch_eval import card_indices, hand_parts, rank_parts, sample_deals
+
+
+def showdown_equity(holes, board, dead_cards=(), samples=500, exact_limit=2, rng=None):
+    """
+    Expected share of the pot for each of `holes` if the board is run out now.
+    :param holes: Hole cards of every player still in the hand.
+    :param board: Community cards dealt so far.
+    :param dead_cards: Other cards known to be out of the deck (e.g. folded hands).
+    :param samples: Random runouts when more than `exact_limit` cards are missing.
+    :param exact_limit: Enumerate every runout when at most this many cards are missing.
+    :param rng: numpy Generator for the sampled runouts.
+    """
+    missing = 5 - len(board)
+    hole_ints = [card_indices(hole) for hole in holes]
+    board_ints = card_indices(board)
+    used = board_ints + card_indices(dead_cards) + [card for hole in hole_ints for card in hole]
+
+    if missing == 0:
+        runouts = np.zeros((1, 0), dtype=np.int64)
+    elif missing <= exact_limit:
+        deck = np.setdiff1d(np.arange(52), used)
+        if missing == 2:
+            first, second = np.triu_indices(len(deck), 1)
+            runouts = np.stack([deck[first], deck[second]], axis=1)
+        else:
+            runouts = np.array(list(itertools.combinations(deck, missing)), dtype=np.int64)
+    else:
+        runouts = sample_deals(rng or np.random.default_rng(), used, samples, missing)
+
+    known = np.broadcast_to(np.asarray(board_ints, dtype=np.int64), (len(runouts), len(board_ints)))
+    board_counts, board_suits = hand_parts(np.hstack([known, runouts]))
+    hole_counts, hole_suits = hand_parts(hole_ints)
+    # Every (hand, runout) pair scored in a single call
+    counts = (hole_counts[:, None] + board_counts[None]).reshape(-1, 13)
+    suits = (hole_suits[:, None] + board_suits[None]).reshape(-1, 4)
+    scores = rank_parts(counts, suits).reshape(len(holes), len(runouts))
+    # Ties split the pot evenly
+    winners = scores == scores.max(axis=0)
+    return (winners / winners.sum(axis=0)).mean(axis=1).tolist()
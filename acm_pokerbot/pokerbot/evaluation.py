@@ -0,0 +1,182 @@
+"""
+Variance-reduced win-rate measurement for a strategy.
+
+Two tricks cut the number of hands needed for a given confidence:
+
+1. Duplicate deals: every deal is replayed with the hero rotated through all
+   seats, so the hero holds each hand the opponents held on that deal.
+2. Luck adjustment: whenever community cards are dealt (including run-outs
+   after an all-in), the hero's pot equity changes by pure luck. We subtract
+   (equity after - equity before) * pot from the result. The expected value of
+   that term is zero, so the estimate stays unbiased, but most of the card
+   noise goes away. Equities are scored in NumPy batches (pokerbot/equity.py),
+   exactly from the flop on, and shared between the rotations of a deal.
+   Deals into small pots are left alone: they hold little of the luck but
+   would cost as much CPU as the big ones.
+
+Both tricks cost hands or CPU, so the report compares the estimators per
+hand played and per CPU-second, not just per deal.
+
+Usage:
+    python -m pokerbot.evaluation --hero strat_AandY --opponents example_strat_3 --deals 2000
+"""
+import argparse
+import math
+import multiprocessing
+import time
+
+import numpy as np
+
+from pokerbot.engine import play_duplicate
+from pokerbot.equity import showdown_equity
+from pokerbot.tuning import Z_SCORES, mean_and_se
+
+
+def luck(result, seat, samples=500, rng=None, cache=None, min_pot=0, exact_limit=2):
+    """
+    Chips `seat` gained or lost to the cards alone in one hand: the sum over
+    every board deal of (equity after - equity before) * pot before the deal.
+    :param cache: Dict shared by the rotations of one deal; the cards are the
+                  same, so equities only depend on who is live and the board size.
+    :param min_pot: Skip deals into pots smaller than this. Whether a term is
+                    skipped is known before the cards come, so the sum stays
+                    unbiased; small pots carry little luck and cost as much.
+    """
+    holes = result["hole"]
+    board = result["board"]
+    cache = {} if cache is None else cache
+
+    def equities(live, size):
+        key = (tuple(live), size)
+        if key not in cache:
+            # Folded hands are gone from the deck, so they are dead cards here
+            dead = [card for i, hole in enumerate(holes) if i not in live for card in hole]
+            cache[key] = showdown_equity([holes[i] for i in live], board[:size], dead, samples=samples,
+                                         exact_limit=exact_limit, rng=rng)
+        return cache[key]
+
+    total = 0.0
+    for event in result["chance"]:
+        live = event["live"]
+        if seat not in live or len(live) < 2 or event["pot"] < min_pot:
+            continue
+        before = len(event["board"])
+        after = before + (3 if not before else 1)
+        index = live.index(seat)
+        total += (equities(live, after)[index] - equities(live, before)[index]) * event["pot"]
+    return total
+
+
+def evaluate_deals(hero, opponents, seeds, big_blind=10, samples=500, min_pot=20):
+    """
+    Play each seed in duplicate. Returns (plain, duplicate, adjusted) results
+    per deal in big blinds, where `plain` only uses the first rotation, plus
+    the CPU seconds spent playing and computing luck.
+    :param min_pot: Smallest pot (in big blinds) whose board deals are luck-adjusted.
+    Runs inside worker processes.
+    """
+    plain, duplicate, adjusted = [], [], []
+    play_cpu = luck_cpu = 0.0
+    for seed in seeds:
+        rng = np.random.default_rng(seed)
+        start = time.process_time()
+        rotations = play_duplicate(hero, opponents, seed, big_blind=big_blind)
+        played = time.process_time()
+        cache = {}
+        lucky = [luck(result, seat, samples=samples, rng=rng, cache=cache, min_pot=min_pot * big_blind)
+                 for seat, result in rotations]
+        play_cpu += played - start
+        luck_cpu += time.process_time() - played
+
+        nets = [result["net"][seat] for seat, result in rotations]
+        plain.append(nets[0] / big_blind)
+        duplicate.append(sum(nets) / len(nets) / big_blind)
+        adjusted.append(sum(net - l for net, l in zip(nets, lucky)) / len(nets) / big_blind)
+    return plain, duplicate, adjusted, play_cpu, luck_cpu
+
+
+def _evaluate_task(task):
+    return evaluate_deals(*task)
+
+
+def evaluate(hero, opponents, deals=2000, processes=None, base_seed=0, chunk_size=25, samples=500, min_pot=20):
+    """
+    Measure `hero` against `opponents` over `deals` duplicate deals on all cores.
+    Returns {"plain"|"duplicate"|"adjusted": [bb per deal, ...]} plus "seats"
+    (hands per duplicate deal) and "play_cpu"/"luck_cpu" (total CPU seconds).
+    """
+    seeds = list(range(base_seed, base_seed + deals))
+    tasks = [(hero, opponents, seeds[i:i + chunk_size], 10, samples, min_pot) for i in range(0, deals, chunk_size)]
+    processes = processes or multiprocessing.cpu_count()
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            outputs = pool.map(_evaluate_task, tasks)
+    else:
+        outputs = [_evaluate_task(task) for task in tasks]
+
+    results = {"plain": [], "duplicate": [], "adjusted": [], "seats": len(opponents) + 1,
+               "play_cpu": 0.0, "luck_cpu": 0.0}
+    for plain, duplicate, adjusted, play_cpu, luck_cpu in outputs:
+        results["plain"].extend(plain)
+        results["duplicate"].extend(duplicate)
+        results["adjusted"].extend(adjusted)
+        results["play_cpu"] += play_cpu
+        results["luck_cpu"] += luck_cpu
+    return results
+
+
+def print_report(results, confidence=0.95, target_se=5.0):
+    """
+    Print bb/100 with standard errors for each estimator, and the hands and
+    CPU time each would need to get the standard error down to `target_se`
+    bb/100. Efficiency is relative to plain play, per hand and per CPU-second:
+    a duplicate deal plays one hand per seat, and the adjusted estimate also
+    pays for the luck computation.
+    """
+    z = Z_SCORES[confidence]
+    deals = len(results["plain"])
+    seats = results["seats"]
+    hand_cpu = results["play_cpu"] / (deals * seats)
+    costs = {  # (hands, CPU seconds) per deal
+        "plain": (1, hand_cpu),
+        "duplicate": (seats, results["play_cpu"] / deals),
+        "adjusted": (seats, (results["play_cpu"] + results["luck_cpu"]) / deals),
+    }
+    print(f"\n=== Win rate (bb/100, {deals} deals, {seats} hands each) ===")
+    baseline = None
+    for name in ("plain", "duplicate", "adjusted"):
+        mean, se = mean_and_se(results[name])
+        mean, se = mean * 100, se * 100
+        hands, cpu = costs[name]
+        needed = math.ceil(deals * (se / target_se) ** 2)
+        line = (f"{name:>9}: {mean:+8.2f} ± {z * se:6.2f}  (se={se:.2f}; for se={target_se}: "
+                f"{needed * hands} hands, {needed * cpu:.1f} CPU s)")
+        # Variance times cost: lower means less work for the same confidence
+        per_hand, per_cpu = se ** 2 * hands, se ** 2 * cpu
+        if baseline is None:
+            baseline = (per_hand, per_cpu)
+        elif per_hand > 0 and per_cpu > 0:
+            line += f"  x{baseline[0] / per_hand:.1f} per hand, x{baseline[1] / per_cpu:.1f} per CPU s"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure a strategy's win rate with duplicate deals.")
+    parser.add_argument("--hero", default="strat_AandY", help="Strategy module to measure")
+    parser.add_argument("--opponents", nargs="+", default=["example_strat_3"],
+                        help="Strategy modules for the other seats")
+    parser.add_argument("--deals", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--samples", type=int, default=500, help="Pre-flop runouts per equity estimate")
+    parser.add_argument("--min-pot", type=float, default=20, help="Only luck-adjust pots of at least this many bb")
+    parser.add_argument("--confidence", type=float, default=0.95, choices=sorted(Z_SCORES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = evaluate((args.hero, None), args.opponents, deals=args.deals, processes=args.processes,
+                       base_seed=args.seed, samples=args.samples, min_pot=args.min_pot)
+    print_report(results, confidence=args.confidence)
+
+
+if __name__ == "__main__":
+    main()
@@ -61,3 +61,72 @@ def eval_hand(hole_cards, community_cards):
         return "One Pair"
 
     return "High Card"
+
+
+
+# Numeric card values shared by the ranking helpers below
+VALUE_MAP = {
+    "2": 2, "3": 3, "4": 4, "5": 5, "6": 6,
+    "7": 7, "8": 8, "9": 9, "10": 10,
+    "J": 11, "Q": 12, "K": 13, "A": 14
+}
+
+# Category index used as the first element of a rank_hand() score
+HAND_CATEGORIES = [
+    "High Card", "One Pair", "Two Pair", "Three of a Kind", "Straight",
+    "Flush", "Full House", "Four of a Kind", "Straight Flush"
+]
+
+
+def _straight_high(values):
+    """Return the top card of the best straight in a set of values, or 0."""
+    if 14 in values:
+        values = values | {1}  # Ace plays low in A-2-3-4-5
+    for high in range(14, 4, -1):
+        if all(v in values for v in range(high - 4, high + 1)):
+            return high
+    return 0
+
+
+def rank_hand(cards):
+    """
+    Score the best five-card hand out of 5-7 cards.
+    Returns a tuple (category, tiebreakers...) where a bigger tuple is a
+    better hand, so two hands can be compared directly at showdown.
+    """
+    values = [VALUE_MAP[card['_rank']] for card in cards]
+    suits = [card['_suit'] for card in cards]
+
+    suit_counter = Counter(suits)
+    flush_suit, flush_count = suit_counter.most_common(1)[0]
+    if flush_count >= 5:
+        flush_values = sorted((v for v, s in zip(values, suits) if s == flush_suit), reverse=True)
+        high = _straight_high(set(flush_values))
+        if high:
+            return (8, high)
+
+    # Group by (count, value) so quads/trips/pairs sort ahead of kickers
+    groups = sorted(((n, v) for v, n in Counter(values).items()), reverse=True)
+    counts = [n for n, _ in groups]
+    ordered = [v for _, v in groups]
+
+    if counts[0] == 4:
+        kicker = max(v for v in ordered[1:])
+        return (7, ordered[0], kicker)
+    if counts[0] == 3 and len(counts) > 1 and counts[1] >= 2:
+        return (6, ordered[0], ordered[1])
+    if flush_count >= 5:
+        return (5,) + tuple(flush_values[:5])
+
+    high = _straight_high(set(values))
+    if high:
+        return (4, high)
+    if counts[0] == 3:
+        return (3, ordered[0]) + tuple(sorted(ordered[1:], reverse=True)[:2])
+    if counts[0] == 2 and counts[1] == 2:
+        # With three pairs the third pair can still play as the kicker
+        kicker = max(ordered[2:])
+        return (2, ordered[0], ordered[1], kicker)
+    if counts[0] == 2:
+        return (1, ordered[0]) + tuple(ordered[1:4])
+    return (0,) + tuple(ordered[:5])
\ No newline at end of file
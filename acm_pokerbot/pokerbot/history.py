@@ -0,0 +1,90 @@
+"""
+Hand-history logging for PokerBot.
+
+Set POKERBOT_HISTORY to a directory (next to SERVER_IP/PORT in your .env) and
+the bot appends one JSON line per hand it was dealt into to hands-YYYY-MM-DD.jsonl:
+
+    {"time": ..., "hole": [...], "board": [...], "street": "turn",
+     "position": "late", "style": "tight-aggressive",
+     "actions": [["pre-flop", "call", 0], ["flop", "bet", 40]], "won": false, "net": -60,
+     "player": "1.2"}
+
+Each hand also stores our "player" id, plus the "table" id when the bot asked
+for one, so bots sharing a directory (several tables from main.py) stay apart.
+`street` is the last street we acted on. `position`/`style` are read from the
+strategy if it keeps them (strat_AandY does). `net` is the chips won or lost,
+when the bot could tell. Hands we never had to act in (a walk in the big
+blind, say) are written too, with no hole cards or actions and the street
+the hand ended on. pokerbot/analytics.py turns a directory of these files
+into summary tables.
+"""
+import json
+import os
+import time
+
+HISTORY_ENV = "POKERBOT_HISTORY"
+
+
+def _stage(community_cards):
+    return {0: "pre-flop", 3: "flop", 4: "turn", 5: "river"}.get(len(community_cards), "unknown")
+
+
+def from_env(table=None, player=None):
+    """A HandHistory writing to POKERBOT_HISTORY, or None when logging is off."""
+    directory = os.getenv(HISTORY_ENV, "").strip()
+    if not directory:
+        return None
+    return HandHistory(directory, table=table, player=player)
+
+
+class HandHistory:
+    def __init__(self, directory, table=None, player=None):
+        """
+        :param table: Table id stored with each hand, when the bot asked for one.
+        :param player: Our player id, stored with each hand so bots sharing a directory stay apart.
+        """
+        self.directory = directory
+        self.table = table
+        self.player = player
+        os.makedirs(directory, exist_ok=True)
+        self.current = None
+
+    def record_decision(self, game_state, move, strategy):
+        """Add one of our decisions to the hand in progress."""
+        community_cards = game_state.get("communityCards", [])
+        street = _stage(community_cards)
+        if self.current is None:
+            self.current = {"hole": game_state.get("holeCards", []), "actions": []}
+        # strat_AandY keeps its state on a module-level `strategy` object
+        state = getattr(strategy, "strategy", strategy)
+        self.current.update({
+            "board": community_cards,
+            "street": street,
+            "position": getattr(state, "position", None),
+            "style": getattr(state, "playing_style", None),
+        })
+        self.current["actions"].append([street, move.get("action", "fold"), move.get("amount", 0)])
+
+    def finish_hand(self, won, net=None, dealt_in=True, board=None, position=None):
+        """
+        Write the hand in progress and start a new one.
+        :param dealt_in: Whether we were dealt into the hand; a hand we sat out isn't written.
+        :param board/position: Describe a hand we never acted in.
+        """
+        if self.current is None:
+            if not dealt_in:
+                return
+            board = board or []
+            self.current = {"hole": [], "board": board, "street": _stage(board), "position": position,
+                            "style": None, "actions": []}
+        record = dict(self.current, time=time.time(), won=won)
+        if self.player is not None:
+            record["player"] = self.player
+        if self.table is not None:
+            record["table"] = self.table
+        if net is not None:
+            record["net"] = net
+        filename = os.path.join(self.directory, time.strftime("hands-%Y-%m-%d.jsonl"))
+        with open(filename, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self.current = None
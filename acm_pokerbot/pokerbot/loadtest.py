@@ -0,0 +1,195 @@
+"""
+Load test for the PokerBot client against the local table server.
+
+For each concurrency level we start a fresh pokerbot/server.py in its own
+process and spread that many bots over a few client processes. Every bot is
+a real PokerBot (same message handling and strategy call path as main.py),
+with its WebSocket swapped for an asyncio one so thousands fit in a handful
+of processes.
+
+Measured per level:
+  - action round trip (server sends privateState -> receives action): p50/p90/p99/max
+  - decisions per second across all tables
+  - client CPU time and peak memory per bot
+  - timeouts, misacts (illegal actions received) and disconnects counted by the server
+Round trips and decisions/sec only count decisions sent after a short
+warm-up, so joining and start-up don't skew them. Disconnects only count
+before the clients' stop time, so bots closing at the end aren't included.
+
+The report ends with the level where throughput stopped growing or latency
+blew up, i.e. where the client saturates.
+
+Usage:
+    python -m pokerbot.loadtest --levels 50 100 250 500 1000 --duration 20 --strategy strat_AandY
+"""
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import resource
+import time
+
+import websockets
+
+from pokerbot.core import PokerBot
+from pokerbot.engine import load_strategy
+from pokerbot.multitable import AsyncSocket
+from pokerbot.server import TableServer
+
+
+async def _run_bot(url, strategy_name, index, stop_at):
+    bot = PokerBot(strategy=load_strategy(strategy_name), name=f"load-{index}", id=f"load-{index}")
+    async with websockets.connect(url, max_size=None) as websocket:
+        bot.ws = AsyncSocket(websocket)
+        bot.send_join()
+        while True:
+            remaining = stop_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                message = await asyncio.wait_for(websocket.recv(), remaining)
+            except (asyncio.TimeoutError, websockets.ConnectionClosed):
+                break
+            bot.on_message(None, message)
+
+
+async def _run_bots(url, strategy_name, indices, stop_at):
+    results = await asyncio.gather(*(_run_bot(url, strategy_name, i, stop_at) for i in indices),
+                                   return_exceptions=True)
+    return sum(1 for r in results if isinstance(r, Exception))
+
+
+def _client_worker(url, strategy_name, indices, stop_at, results):
+    """One client process: runs its bots until `stop_at` and reports resource use."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        errors = asyncio.run(_run_bots(url, strategy_name, indices, stop_at))
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    results.put({
+        "bots": len(indices),
+        "errors": errors,
+        "cpu": usage.ru_utime + usage.ru_stime,
+        "max_rss_kb": usage.ru_maxrss,
+    })
+
+
+def _server_worker(port, seats, timeout, duration, ready, results):
+    """The table server process: runs for `duration` and reports what it saw."""
+    server = TableServer(seats=seats, action_timeout=timeout, hand_delay=0, rebuy=True)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        asyncio.run(server.serve("127.0.0.1", port, duration=duration, ready=ready.set))
+    latencies = [latency for player in server.players for latency in player.latencies]
+    results.put({
+        "tables": len(server.tables),
+        "hands": sum(table.hands_played for table in server.tables.values()),
+        "latencies": latencies,
+        "timeouts": sum(player.timeouts for player in server.players),
+        "misacts": sum(player.misacts for player in server.players),
+        "disconnected_at": [player.disconnected_at for player in server.players
+                            if player.disconnected_at is not None],
+    })
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_level(bots, strategy_name, duration, port, seats=6, timeout=2.0, processes=None, warmup=2.0):
+    """
+    Run `bots` clients for `warmup` + `duration` seconds and return the
+    measurements; latency and throughput cover only the last `duration` seconds.
+    """
+    processes = max(1, min(processes or multiprocessing.cpu_count(), bots))
+    results = multiprocessing.Queue()
+    ready = multiprocessing.Event()
+
+    server = multiprocessing.Process(target=_server_worker,
+                                     args=(port, seats, timeout, duration + warmup + 1, ready, results))
+    server.start()
+    ready.wait()
+
+    measure_from = time.monotonic() + warmup
+    stop_at = measure_from + duration
+    clients = []
+    for p in range(processes):
+        indices = list(range(p, bots, processes))
+        process = multiprocessing.Process(target=_client_worker,
+                                          args=(f"ws://127.0.0.1:{port}", strategy_name, indices, stop_at, results))
+        process.start()
+        clients.append(process)
+
+    reports = [results.get() for _ in range(processes + 1)]
+    for process in clients + [server]:
+        process.join()
+
+    server_report = next(r for r in reports if "latencies" in r)
+    client_reports = [r for r in reports if "bots" in r]
+    latencies = [latency for sent_at, latency in server_report["latencies"] if sent_at >= measure_from]
+    return {
+        "bots": bots,
+        "tables": server_report["tables"],
+        "hands": server_report["hands"],
+        "decisions_per_sec": len(latencies) / duration,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p90_ms": percentile(latencies, 0.9) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=float("nan")) * 1000,
+        "cpu_ms_per_bot": sum(r["cpu"] for r in client_reports) / bots * 1000,
+        "rss_mb_per_bot": sum(r["max_rss_kb"] for r in client_reports) / bots / 1024,
+        "timeouts": server_report["timeouts"],
+        "misacts": server_report["misacts"],
+        "disconnects": sum(1 for at in server_report["disconnected_at"] if at < stop_at),
+        "errors": sum(r["errors"] for r in client_reports),
+    }
+
+
+def find_saturation(rows, timeout):
+    """First level where throughput grew < 10% or p99 passed half the action timeout."""
+    for previous, row in zip(rows, rows[1:]):
+        if row["decisions_per_sec"] < previous["decisions_per_sec"] * 1.1:
+            return row, "throughput stopped growing"
+        if row["p99_ms"] > timeout * 500:
+            return row, "p99 latency passed half the action timeout"
+    return None, None
+
+
+def print_report(rows, timeout):
+    print("\n=== Load test ===")
+    print(f"{'bots':>6} {'tables':>6} {'dec/s':>8} {'p50ms':>7} {'p90ms':>7} {'p99ms':>7} {'maxms':>8} "
+          f"{'cpu ms/bot':>10} {'MB/bot':>7} {'timeouts':>8} {'misacts':>7} {'drops':>5} {'errors':>6}")
+    for r in rows:
+        print(f"{r['bots']:>6} {r['tables']:>6} {r['decisions_per_sec']:>8.0f} {r['p50_ms']:>7.2f} "
+              f"{r['p90_ms']:>7.2f} {r['p99_ms']:>7.2f} {r['max_ms']:>8.2f} {r['cpu_ms_per_bot']:>10.1f} "
+              f"{r['rss_mb_per_bot']:>7.2f} {r['timeouts']:>8} {r['misacts']:>7} {r['disconnects']:>5} {r['errors']:>6}")
+    row, reason = find_saturation(rows, timeout)
+    if row is None:
+        print("\n[INFO] No saturation in the levels tested.")
+    else:
+        print(f"\n[INFO] Saturates around {row['bots']} bots: {reason}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test PokerBot clients against the local table server.")
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 100, 250, 500, 1000],
+                        help="Numbers of concurrent bots to try")
+    parser.add_argument("--strategy", default="strat_AandY", help="Strategy module every bot plays")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds measured per level")
+    parser.add_argument("--seats", type=int, default=6)
+    parser.add_argument("--timeout", type=float, default=2.0, help="Server action timeout (seconds)")
+    parser.add_argument("--processes", type=int, default=None, help="Client processes (default: all cores)")
+    parser.add_argument("--port", type=int, default=3104)
+    args = parser.parse_args()
+
+    rows = []
+    for bots in args.levels:
+        print(f"[INFO] Running {bots} bots for {args.duration}s...")
+        rows.append(run_level(bots, args.strategy, args.duration, args.port, seats=args.seats,
+                              timeout=args.timeout, processes=args.processes))
+    print_report(rows, args.timeout)
+
+
+if __name__ == "__main__":
+    main()
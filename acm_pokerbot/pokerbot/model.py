@@ -0,0 +1,206 @@
+"""
+Small learned policy/value model for PokerStrategy decisions.
+
+A decision is described by a feature vector (see FEATURES) and mapped by a
+one-hidden-layer network to:
+  - probabilities over ACTIONS (fold, check/call, three pot-fraction raises,
+    all-in), with illegal actions masked out, and
+  - a value: the expected result of the hand in starting stacks.
+
+Inference is plain NumPy. predict() scores a whole batch of decisions at
+once (used by self-play in pokerbot/training.py); predict_one() scores a
+single decision into buffers allocated up front, which keeps live play
+allocation-free and in the tens of microseconds.
+"""
+import os
+
+import numpy as np
+
+from pokerbot.batch_eval import hand_parts, rank_parts
+from pokerbot.table_model import POSITIONS
+
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "data", "model.npz")
+
+STAGES = ("pre-flop", "flop", "turn", "river")
+FEATURES = (
+    "equity", "required_equity", "spr", "facing",
+    "pre-flop", "flop", "turn", "river",
+    "early", "middle", "late",
+    "opponents", "opponent_aggression",
+)
+ACTIONS = ("fold", "call", "raise_half", "raise_pot", "raise_2pot", "all_in")
+RAISE_SIZES = {"raise_half": 0.5, "raise_pot": 1.0, "raise_2pot": 2.0}  # Pot fractions
+
+
+def features(game_state, equity, pot_odds, position, opponents=1, opponent_aggression=0.5, out=None):
+    """
+    Feature vector for one decision, written into `out` if given.
+    :param pot_odds: PokerStrategy.calculate_pot_odds() for the decision (inf with no bet).
+    :param opponent_aggression: How often opponents have had us facing a bet (0-1).
+    """
+    x = np.zeros(len(FEATURES)) if out is None else out
+    x.fill(0.0)
+    pot = game_state.get("pot", 0)
+    stack = game_state.get("stackSize", 0)
+    current_bet = game_state.get("currentBet", 0)
+    community_cards = game_state.get("communityCards", [])
+
+    x[0] = equity
+    x[1] = 1 / (pot_odds + 1)
+    x[2] = np.log1p(stack / max(pot, 1)) / 3
+    x[3] = min(current_bet / max(pot, 1), 2)
+    x[4 + {0: 0, 3: 1, 4: 2}.get(len(community_cards), 3)] = 1
+    x[8 + POSITIONS.index(position if position in POSITIONS else "middle")] = 1
+    x[11] = opponents / 5
+    x[12] = opponent_aggression
+    return x
+
+
+def update_aggression(aggression, game_state, memory=0.95):
+    """Decayed average of how often we face a bet after the flop."""
+    facing_bet = game_state.get("currentBet", 0) > 0 and bool(game_state.get("communityCards"))
+    return memory * aggression + (1 - memory) * facing_bet
+
+
+def legal_mask(available_actions):
+    """Boolean mask over ACTIONS for the availableActions of a decision."""
+    mask = np.zeros(len(ACTIONS), dtype=bool)
+    # Folding when checking is free is never right (and illegal on HeadlessTable)
+    mask[0] = "fold" in available_actions and "check" not in available_actions
+    mask[1] = "check" in available_actions or "call" in available_actions
+    mask[2:] = "bet" in available_actions or "raise" in available_actions
+    if not mask.any():
+        mask[0] = True
+    return mask
+
+
+def to_move(action, game_state):
+    """Turn an ACTIONS index into the {"action", "amount"} dict PokerBot sends."""
+    name = ACTIONS[action]
+    available = game_state.get("availableActions", [])
+    if name == "fold":
+        return {"action": "fold", "amount": 0}
+    if name == "call":
+        return {"action": "check" if "check" in available else "call", "amount": 0}
+
+    min_raise = game_state.get("minRaise", 0)
+    max_bet = game_state.get("maxBet", 0)
+    if name == "all_in":
+        amount = max_bet
+    else:
+        amount = game_state.get("currentBet", 0) + RAISE_SIZES[name] * game_state.get("pot", 0)
+    return {"action": "bet" if "bet" in available else "raise",
+            "amount": int(max(min_raise, min(amount, max_bet)))}
+
+
+def batch_equity(holes, boards, samples=64, rng=None, opponents=1):
+    """
+    Equity against random holdings for many decisions at once.
+    :param holes: (D, 2) card ints.
+    :param boards: D lists of 0-5 card ints.
+    :param opponents: Active opponents, one number for all decisions or one per decision.
+    Returns a (D,) array, each from `samples` random opponent hands and run-outs.
+    """
+    rng = rng or np.random.default_rng()
+    holes = np.asarray(holes, dtype=np.int64).reshape(-1, 2)
+    equity = np.zeros(len(holes))
+    lengths = np.array([len(board) for board in boards])
+    opponents = np.broadcast_to(np.asarray(opponents, dtype=np.int64), lengths.shape)
+    for length, count in set(zip(lengths.tolist(), opponents.tolist())):
+        rows = np.nonzero((lengths == length) & (opponents == count))[0]
+        known = np.hstack([holes[rows], np.array([boards[i] for i in rows], dtype=np.int64).reshape(len(rows), length)])
+        known = np.repeat(known, samples, axis=0)
+
+        # Random order of the unseen cards per sample: known cards sort last
+        keys = rng.random((len(known), 52))
+        np.put_along_axis(keys, known, 2.0, axis=1)
+        holdings = 2 * count
+        drawn = np.argpartition(keys, holdings + 4 - length, axis=1)[:, :holdings + 5 - length]
+
+        board_counts, board_suits = hand_parts(np.hstack([known[:, 2:], drawn[:, holdings:]]))
+        hole_counts, hole_suits = hand_parts(known[:, :2])
+        ours = rank_parts(board_counts + hole_counts, board_suits + hole_suits)
+        best = np.zeros_like(ours)
+        ties = np.zeros_like(ours)
+        for k in range(count):
+            opp_counts, opp_suits = hand_parts(drawn[:, 2 * k:2 * k + 2])
+            theirs = rank_parts(board_counts + opp_counts, board_suits + opp_suits)
+            ties += theirs == ours
+            best = np.maximum(best, theirs)
+        # Win outright, split with everyone who ties, or lose
+        shares = np.where(ours > best, 1.0, np.where(ours == best, 1.0 / (1 + ties), 0.0))
+        equity[rows] = shares.reshape(len(rows), samples).mean(axis=1)
+    return equity
+
+
+class PolicyValueNet:
+    def __init__(self, weights):
+        """
+        :param weights: Dict with W1 (features, hidden), b1, Wp (hidden, actions),
+                        bp, Wv (hidden,) and bv (a scalar array).
+        """
+        self.weights = {name: np.asarray(value, dtype=np.float64) for name, value in weights.items()}
+        hidden = self.weights["b1"].shape[0]
+        # Reused by predict_one, so a live decision doesn't build new arrays
+        self._hidden = np.zeros(hidden)
+        self._logits = np.zeros(len(ACTIONS))
+        self._penalty = np.zeros(len(ACTIONS))
+
+    @classmethod
+    def initialize(cls, hidden=64, seed=None):
+        """A fresh network with small random weights."""
+        rng = np.random.default_rng(seed)
+        return cls({
+            "W1": rng.normal(0, np.sqrt(2 / len(FEATURES)), (len(FEATURES), hidden)),
+            "b1": np.zeros(hidden),
+            "Wp": rng.normal(0, 0.01, (hidden, len(ACTIONS))),
+            "bp": np.zeros(len(ACTIONS)),
+            "Wv": rng.normal(0, 0.01, hidden),
+            "bv": np.zeros(()),
+        })
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def save(self, path):
+        np.savez(path, **self.weights)
+
+    def forward(self, x, masks):
+        """
+        Batched pass over (N, features) inputs with (N, actions) legal masks.
+        Returns (probabilities, values, hidden activations).
+        """
+        w = self.weights
+        hidden = np.maximum(x @ w["W1"] + w["b1"], 0)
+        logits = np.where(masks, hidden @ w["Wp"] + w["bp"], -np.inf)
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs, hidden @ w["Wv"] + w["bv"], hidden
+
+    def predict(self, x, masks):
+        """(probabilities, values) for a batch of decisions."""
+        probs, values, _ = self.forward(x, masks)
+        return probs, values
+
+    def predict_one(self, x, mask):
+        """
+        (probabilities, value) for one decision. The probabilities are a
+        buffer that the next call overwrites, so copy them to keep them.
+        """
+        w = self.weights
+        hidden, logits, penalty = self._hidden, self._logits, self._penalty
+        np.dot(x, w["W1"], out=hidden)
+        hidden += w["b1"]
+        np.maximum(hidden, 0, out=hidden)
+        np.dot(hidden, w["Wp"], out=logits)
+        logits += w["bp"]
+        np.subtract(1.0, mask, out=penalty)
+        penalty *= 1e9
+        logits -= penalty
+        logits -= logits.max()
+        np.exp(logits, out=logits)
+        logits /= logits.sum()
+        return logits, float(hidden @ w["Wv"] + w["bv"])
@@ -0,0 +1,210 @@
+"""
+Play several tables from one process.
+
+Every table gets its own PokerBot and its own strategy instance, so per-hand
+state (hand count, position, round history, sizing caches) never leaks from
+one table to another. Read-only data is loaded once and shared by all of
+them: the batch_eval lookup tables, strat_AandY's PREFLOP_CHART, learned
+weights and pre-flop equities in strat_learned, and the board-texture index.
+
+All connections share one asyncio loop. Table-wide messages are applied as
+they arrive. Decisions (privateState) are queued with a deadline of arrival
+plus the action timeout, and run one at a time, earliest deadline first.
+That way a burst of requests from some tables can't starve one that has
+been waiting longer. An exception while handling a message is logged and
+only costs that one message: if it was a decision we hadn't answered yet,
+the table gets a check (or fold) instead, and every table keeps playing. Messages for a table that arrive while it has a
+decision queued wait behind that decision, so the strategy sees the table
+as it was when the server asked.
+
+Usage:
+    python -m pokerbot.multitable --tables 4 --strategy strat_AandY
+(SERVER_IP and PORT come from .env, as for main.py)
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import heapq
+import itertools
+import json
+import os
+import time
+
+import websockets
+from dotenv import load_dotenv
+
+from pokerbot.core import PokerBot
+from pokerbot.engine import load_strategy
+
+
+class AsyncSocket:
+    """Stands in for PokerBot.ws: queues sends on an asyncio WebSocket."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.pending = set()
+        self.sent = 0
+
+    def send(self, message):
+        self.sent += 1
+        task = asyncio.get_running_loop().create_task(self.websocket.send(message))
+        self.pending.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task):
+        self.pending.discard(task)
+        # A send racing the connection closing at the end of a run is expected
+        if not task.cancelled():
+            task.exception()
+
+
+class TableSeat:
+    """Our bot at one table, plus the messages waiting on its queued decision."""
+
+    def __init__(self, bot, action_timeout):
+        self.bot = bot
+        self.action_timeout = action_timeout
+        self.pending = collections.deque()
+
+
+class MultiTableRunner:
+    def __init__(self, url, tables=2, strategy="strat_AandY", params=None, name="Disruptify", team_id="1",
+                 action_timeout=5.0, table_ids=None):
+        """
+        :param tables: Number of tables (connections) to play.
+        :param strategy: Strategy module; every table gets a fresh instance of it.
+        :param team_id: Player ids are "<team_id>.<n>", so the first table keeps main.py's "1.1".
+        :param action_timeout: The server's time to act, used for decision deadlines.
+        :param table_ids: Optional tableId to ask for at each table.
+        """
+        self.url = url
+        self.seats = []
+        for i in range(tables):
+            bot = PokerBot(strategy=load_strategy(strategy, params=params), name=f"{name}-{i + 1}",
+                           id=f"{team_id}.{i + 1}", table_id=table_ids[i] if table_ids else None)
+            self.seats.append(TableSeat(bot, action_timeout))
+        # One profiler for the process, so profile file numbers don't collide
+        for seat in self.seats[1:]:
+            seat.bot.profiler = self.seats[0].bot.profiler
+
+        self._queue = []  # (deadline, order, seat) per queued decision
+        self._order = itertools.count()
+        self._wakeup = asyncio.Event()
+        self.decisions = 0
+        self.late = 0
+        self.waits = []  # Seconds each decision sat in the queue
+        self.errors = 0
+
+    def _handle(self, seat, data):
+        """Pass one message to the seat's bot, logging (not raising) anything it throws."""
+        sent = seat.bot.ws.sent
+        try:
+            seat.bot.handle_message(data)
+        except Exception as error:
+            self.errors += 1
+            print(f"[ERROR] {seat.bot.name}: {type(error).__name__} handling {data.get('type')}: {error}")
+            if data.get("type") == "privateState" and seat.bot.ws.sent == sent:
+                # Don't leave the table waiting out the timeout on us
+                available = data.get("state", {}).get("availableActions", [])
+                seat.bot.send_action("check" if "check" in available else "fold")
+
+    async def _receive(self, seat, websocket):
+        try:
+            async for message in websocket:
+                try:
+                    data = json.loads(message)
+                except ValueError:
+                    continue
+                decision = data.get("type") == "privateState"
+                if decision or seat.pending:
+                    seat.pending.append((time.monotonic(), data))
+                    if decision:
+                        heapq.heappush(self._queue,
+                                       (time.monotonic() + seat.action_timeout, next(self._order), seat))
+                        self._wakeup.set()
+                else:
+                    self._handle(seat, data)
+        except websockets.ConnectionClosed:
+            pass
+        print(f"[WARN] {seat.bot.name}: connection closed")
+
+    def _run_decision(self, seat):
+        """Handle the seat's next decision, then the table messages queued behind it."""
+        decided = False
+        while seat.pending:
+            arrived, data = seat.pending[0]
+            if data.get("type") == "privateState":
+                if decided:
+                    break
+                decided = True
+                self.waits.append(time.monotonic() - arrived)
+            seat.pending.popleft()
+            self._handle(seat, data)
+
+    async def _serve_decisions(self):
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            deadline, _, seat = heapq.heappop(self._queue)
+            self._run_decision(seat)
+            self.decisions += 1
+            if time.monotonic() > deadline:
+                self.late += 1
+            # Let the sockets deliver new requests before picking the next one
+            await asyncio.sleep(0)
+
+    async def run(self, duration=None):
+        """Join every table and play until the connections close (or for `duration` seconds)."""
+        async with contextlib.AsyncExitStack() as stack:
+            receivers = []
+            for seat in self.seats:
+                websocket = await stack.enter_async_context(websockets.connect(self.url, max_size=None))
+                seat.bot.ws = AsyncSocket(websocket)
+                seat.bot.send_join()
+                receivers.append(asyncio.create_task(self._receive(seat, websocket)))
+            scheduler = asyncio.create_task(self._serve_decisions())
+            await asyncio.wait(receivers, timeout=duration)
+            for task in receivers + [scheduler]:
+                task.cancel()
+        self.print_summary()
+
+    def print_summary(self):
+        waits = sorted(self.waits)
+        worst = waits[-1] * 1000 if waits else 0.0
+        p99 = waits[min(len(waits) - 1, int(0.99 * len(waits)))] * 1000 if waits else 0.0
+        print(f"\n[INFO] {self.decisions} decisions over {len(self.seats)} tables, {self.late} past their deadline; "
+              f"queue wait p99 {p99:.2f}ms, max {worst:.2f}ms; {self.errors} handler errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play several tables from one process.")
+    parser.add_argument("--tables", type=int, default=2)
+    parser.add_argument("--strategy", default="strat_AandY", help="Strategy module each table plays")
+    parser.add_argument("--name", default="Disruptify")
+    parser.add_argument("--id", default="1", help="Team id; table n plays as <id>.<n>")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Server action timeout (seconds)")
+    parser.add_argument("--table-ids", nargs="+", default=None, help="tableId to request at each table")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    args = parser.parse_args()
+
+    load_dotenv()
+    server_ip = os.getenv("SERVER_IP")
+    if not server_ip:
+        print("[ERROR] SERVER_IP is not set in your .env file.")
+        return
+    url = f"ws://{server_ip}:{os.getenv('PORT', 3004)}"
+    tables = len(args.table_ids) if args.table_ids else args.tables
+    runner = MultiTableRunner(url, tables=tables, strategy=args.strategy, name=args.name, team_id=args.id,
+                              action_timeout=args.timeout, table_ids=args.table_ids)
+    try:
+        print(f"[INFO] Playing {tables} tables on {url}...")
+        asyncio.run(runner.run(duration=args.duration))
+    except KeyboardInterrupt:
+        print("\n[INFO] Runner stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Hand strength and hand potential on the flop and turn.
+
+We compare our hand with every possible opponent holding now, and with a
+sample of holdings after the board is run out (every river on the turn, a
+sample of turn+river run-outs on the flop). Each comparison set is one
+batch_eval call, with the board's rank counts summed once and added to
+every holding. From that:
+
+  hs       share of opponent holdings we beat right now (ties count half)
+  ppot     chance we're behind now but ahead by the river (positive potential)
+  npot     chance we're ahead now but behind by the river (negative potential)
+  ehs      effective hand strength: hs * (1 - npot) + (1 - hs) * ppot
+  ehs2     mean over run-outs of (hand strength on the river) squared
+  outs     next cards that improve our hand category without improving the board's
+
+Results are cached per (hole, board), so asking again within the same
+decision or street costs a dict lookup.
+"""
+import itertools
+
+import numpy as np
+
+from pokerbot.batch_eval import card_indices, hand_parts, rank_parts
+
+
+def _card_masks(cards):
+    """One 52-bit mask per row of card ints."""
+    return np.bitwise_or.reduce(np.left_shift(1, cards.astype(np.int64)), axis=1)
+
+
+class HandPotential:
+    def __init__(self, max_holdings=64, max_runouts=128, seed=None):
+        """
+        :param max_holdings: Opponent holdings carried to the river; hand strength
+                             now always uses all of them. None for every holding.
+        :param max_runouts: Run-outs per holding; the flop has 990 and the turn
+                            up to 46, so beyond this a random sample is used.
+                            None for every run-out.
+        """
+        self.max_holdings = max_holdings
+        self.max_runouts = max_runouts
+        self.rng = np.random.default_rng(seed)
+        self._hole = None
+        self._cache = {}
+
+    def evaluate(self, hole_cards, community_cards):
+        """Potential stats for our hole cards on a 3- or 4-card board, as a dict."""
+        hole = tuple(card_indices(hole_cards))
+        board = tuple(card_indices(community_cards))
+        if len(board) not in (3, 4):
+            raise ValueError("Hand potential needs a flop or turn board")
+        # Only this hand's boards are worth keeping
+        if hole != self._hole:
+            self._hole = hole
+            self._cache = {}
+        if board not in self._cache:
+            self._cache[board] = self._compute(list(hole), list(board))
+        return self._cache[board]
+
+    def _sample(self, rows, limit):
+        if limit is None or len(rows) <= limit:
+            return rows
+        return rows[self.rng.choice(len(rows), limit, replace=False)]
+
+    def _compute(self, hole, board):
+        deck = np.setdiff1d(np.arange(52), hole + board)
+        opponents = np.array(list(itertools.combinations(deck, 2)))
+        hole_counts, hole_suits = hand_parts([hole])
+        board_counts, board_suits = hand_parts([board])
+        opp_counts, opp_suits = hand_parts(opponents)
+
+        # Now: one comparison per opponent holding
+        ours_now = rank_parts(hole_counts + board_counts, hole_suits + board_suits)[0]
+        theirs_now = rank_parts(opp_counts + board_counts, opp_suits + board_suits)
+        now = np.sign(ours_now - theirs_now) + 1  # 0 behind, 1 tied, 2 ahead
+        hs = (np.sum(now == 2) + np.sum(now == 1) / 2) / len(opponents)
+
+        # River: every (holding, run-out) pair that doesn't reuse a card
+        picked = self._sample(np.arange(len(opponents)), self.max_holdings)
+        runouts = self._sample(np.array(list(itertools.combinations(deck, 5 - len(board)))), self.max_runouts)
+        runout_counts, runout_suits = hand_parts(runouts)
+        final_counts, final_suits = runout_counts + board_counts, runout_suits + board_suits
+        ours_final = rank_parts(final_counts + hole_counts, final_suits + hole_suits)
+
+        valid = (_card_masks(opponents[picked])[:, None] & _card_masks(runouts)[None, :]) == 0
+        opp_rows, runout_rows = np.nonzero(valid)
+        opp_rows_all = picked[opp_rows]
+        theirs_final = rank_parts(opp_counts[opp_rows_all] + final_counts[runout_rows],
+                                  opp_suits[opp_rows_all] + final_suits[runout_rows])
+        final = np.sign(ours_final[runout_rows] - theirs_final) + 1
+
+        # hp[i][j]: opponent/run-out pairs going from state i now to state j at the river
+        hp = np.bincount(now[opp_rows_all] * 3 + final, minlength=9).reshape(3, 3)
+        totals = hp.sum(axis=1)
+        behind, tied, ahead = 0, 1, 2
+        ppot_den = totals[behind] + totals[tied] / 2
+        npot_den = totals[ahead] + totals[tied] / 2
+        ppot = (hp[behind, ahead] + hp[behind, tied] / 2 + hp[tied, ahead] / 2) / ppot_den if ppot_den else 0.0
+        npot = (hp[ahead, behind] + hp[tied, behind] / 2 + hp[ahead, tied] / 2) / npot_den if npot_den else 0.0
+
+        # Hand strength on each river, over the holdings that run-out leaves possible
+        river_strength = (np.bincount(runout_rows, weights=final / 2, minlength=len(runouts))
+                          / np.maximum(np.bincount(runout_rows, minlength=len(runouts)), 1))
+
+        return {
+            "hs": float(hs),
+            "ppot": float(ppot),
+            "npot": float(npot),
+            "ehs": float(hs * (1 - npot) + (1 - hs) * ppot),
+            "ehs2": float(np.mean(river_strength ** 2)),
+            "outs": _outs(hole, board, deck),
+        }
+
+
+def _outs(hole, board, deck):
+    """Unseen cards that raise our hand category more than they raise the board's."""
+    hole_counts, hole_suits = hand_parts([hole])
+    board_counts, board_suits = hand_parts([board])
+    card_counts, card_suits = hand_parts(deck[:, None])
+    ours_now = rank_parts(hole_counts + board_counts, hole_suits + board_suits) >> 20
+    board_now = rank_parts(board_counts, board_suits) >> 20
+    ours = rank_parts(card_counts + hole_counts + board_counts, card_suits + hole_suits + board_suits) >> 20
+    board_next = rank_parts(card_counts + board_counts, card_suits + board_suits) >> 20
+    return int(np.sum((ours > ours_now) & (ours - ours_now > board_next - board_now)))
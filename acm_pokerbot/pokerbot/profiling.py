@@ -0,0 +1,228 @@
+"""
+Opt-in per-decision profiling for PokerBot.
+
+Turn it on with the POKERBOT_PROFILE environment variable (next to SERVER_IP
+and PORT in your .env), e.g.
+
+    POKERBOT_PROFILE="every=50"                  # every 50th decision
+    POKERBOT_PROFILE="threshold_ms=20"           # only decisions slower than 20ms
+    POKERBOT_PROFILE="street=river,mode=trace"   # every river decision, traced
+    POKERBOT_PROFILE="1"                         # every decision
+
+Options (comma separated):
+    every=N          profile every Nth decision
+    threshold_ms=X   keep decisions that took at least X ms
+    street=S         only pre-flop / flop / turn / river decisions
+    mode=M           "sample" (stack sampling, default) or "trace" (every call, exact times)
+    interval_ms=X    sampling interval (default 1)
+    out=DIR          where to write profiles (default "profiles")
+
+Sample mode only sees decisions that last several sampling intervals, so it
+suits slow decisions (threshold_ms=20, say). Most strat_AandY decisions take
+well under a millisecond; use mode=trace for those. A decision that ends
+before the first sample is reported but no file is written.
+
+Each kept decision is written as a collapsed-stack file (one "a;b;c count"
+line per stack) that flamegraph.pl, speedscope or inferno can read. The first
+frames are the street and a category (evaluator, equity, bet_sizing, io or
+strategy) so time can be compared across those parts at a glance.
+
+When the variable isn't set PokerBot holds no profiler at all, so the only
+cost is one `is not None` check per decision.
+"""
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+PROFILE_ENV = "POKERBOT_PROFILE"
+
+# (category, file names, function names) - the outermost matching frame wins
+CATEGORY_RULES = [
+    ("io", {"_abnf.py", "_core.py", "_app.py", "_socket.py", "socket.py", "ssl.py", "encoder.py"},
+     {"send_action", "send", "dumps"}),
+    ("bet_sizing", {"sizing.py"}, {"determine_bet_size"}),
+    ("equity", {"equity.py"}, {"calculate_win_probability", "calculate_pot_odds", "calculate_expected_value"}),
+    ("evaluator", {"evaluator.py"}, {"eval_hand", "rank_hand"}),
+]
+
+
+def _stage(community_cards):
+    return {0: "pre-flop", 3: "flop", 4: "turn", 5: "river"}.get(len(community_cards), "unknown")
+
+
+def categorize(path):
+    """Category for a stack of (file, function) frames, outermost first."""
+    for filename, func in path:
+        for category, files, funcs in CATEGORY_RULES:
+            if filename in files or func.rsplit(".", 1)[-1] in funcs:
+                return category
+    return "strategy"
+
+
+def from_env():
+    """Build a DecisionProfiler from POKERBOT_PROFILE, or None when profiling is off."""
+    spec = os.getenv(PROFILE_ENV, "").strip()
+    if not spec or spec.lower() in ("0", "off", "false"):
+        return None
+    if spec.lower() in ("1", "on", "true"):
+        return DecisionProfiler()
+
+    options = {}
+    for item in spec.split(","):
+        key, _, value = item.partition("=")
+        options[key.strip()] = value.strip()
+    return DecisionProfiler(
+        every=int(options["every"]) if "every" in options else None,
+        threshold_ms=float(options["threshold_ms"]) if "threshold_ms" in options else None,
+        street=options.get("street"),
+        mode=options.get("mode", "sample"),
+        interval_ms=float(options.get("interval_ms", 1)),
+        out_dir=options.get("out", "profiles"),
+    )
+
+
+class _Tracer:
+    """Exact call-stack timings via sys.setprofile (only while a decision runs)."""
+
+    def __init__(self):
+        self.stack = []  # [frame key, start time, time spent in children]
+        self.stacks = defaultdict(float)
+
+    def start(self):
+        sys.setprofile(self._callback)
+
+    def stop(self):
+        sys.setprofile(None)
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter()
+        if event == "call":
+            key = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+        elif event == "c_call":
+            key = (getattr(arg, "__module__", None) or "builtins", getattr(arg, "__qualname__", str(arg)))
+        elif event in ("return", "c_return", "c_exception"):
+            # Returns from frames that started before profiling are ignored
+            if not self.stack:
+                return
+            key, start, children = self.stack.pop()
+            elapsed = now - start
+            path = tuple(entry[0] for entry in self.stack) + (key,)
+            self.stacks[path] += (elapsed - children) * 1e6  # microseconds of self time
+            if self.stack:
+                self.stack[-1][2] += elapsed
+            return
+        else:
+            return
+        self.stack.append([key, now, 0.0])
+
+
+class _Sampler:
+    """Periodic stack samples of the deciding thread from a helper thread."""
+
+    def __init__(self, anchor, interval):
+        self.anchor = anchor
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.stacks = defaultdict(float)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._switch_interval = None
+
+    def start(self):
+        # A busy deciding thread only hands over the GIL every switch interval (5ms by default)
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 2))
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            path = []
+            while frame is not None and frame is not self.anchor:
+                path.append((os.path.basename(frame.f_code.co_filename), frame.f_code.co_name))
+                frame = frame.f_back
+            if path:
+                self.stacks[tuple(reversed(path))] += 1
+
+
+class DecisionProfiler:
+    """Decides which decisions to profile, runs the profiler and writes the results."""
+
+    def __init__(self, every=None, threshold_ms=None, street=None, mode="sample", interval_ms=1.0,
+                 out_dir="profiles"):
+        if mode not in ("sample", "trace"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.every = every
+        self.threshold_ms = threshold_ms
+        self.street = street
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.out_dir = out_dir
+        self.decisions = 0
+        os.makedirs(out_dir, exist_ok=True)
+
+    def begin(self, game_state):
+        """
+        Call right before the strategy runs. Returns a handle to pass to `end`,
+        or None when this decision isn't profiled.
+        """
+        self.decisions += 1
+        street = _stage(game_state.get("communityCards", []))
+        if self.street is not None and street != self.street:
+            return None
+
+        picked = self.every is not None and self.decisions % self.every == 0
+        # With no selector given, every (matching) decision is profiled
+        wanted = picked or self.threshold_ms is not None or self.every is None
+        if not wanted:
+            return None
+
+        if self.mode == "trace":
+            profiler = _Tracer()
+        else:
+            profiler = _Sampler(sys._getframe(1), self.interval)
+        handle = {"decision": self.decisions, "street": street, "picked": picked or self.threshold_ms is None,
+                  "profiler": profiler, "start": time.perf_counter()}
+        profiler.start()
+        return handle
+
+    def end(self, handle):
+        """Call once the action has been sent. Writes the profile if the decision is kept."""
+        profiler = handle["profiler"]
+        profiler.stop()
+        elapsed_ms = (time.perf_counter() - handle["start"]) * 1000
+        slow = self.threshold_ms is not None and elapsed_ms >= self.threshold_ms
+        if not (handle["picked"] or slow):
+            return None
+        if not profiler.stacks:
+            # Ended before the sampler fired; an empty file would only trip up flamegraph tools
+            print(f"[PROFILE] decision {handle['decision']} ({handle['street']}) took {elapsed_ms:.2f}ms, "
+                  f"shorter than the {self.interval * 1000:g}ms sampling interval; use mode=trace to profile it")
+            return None
+
+        totals = defaultdict(float)
+        lines = []
+        root = f"decision:{handle['street']}"
+        for path, weight in profiler.stacks.items():
+            category = categorize(path)
+            totals[category] += weight
+            frames = ";".join(f"{filename}:{func}" for filename, func in path)
+            count = max(1, int(round(weight)))
+            lines.append(f"{root};{category};{frames} {count}")
+
+        filename = os.path.join(self.out_dir, f"decision_{handle['decision']:06d}_{handle['street']}.folded")
+        with open(filename, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+        unit = "us" if self.mode == "trace" else "samples"
+        summary = ", ".join(f"{k}={v:.0f}" for k, v in sorted(totals.items(), key=lambda kv: -kv[1]))
+        print(f"[PROFILE] decision {handle['decision']} ({handle['street']}) took {elapsed_ms:.2f}ms "
+              f"[{unit}: {summary}] -> {filename}")
+        return filename
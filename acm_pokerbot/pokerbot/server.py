@@ -0,0 +1,294 @@
+"""
+Local stand-in for the node-poker-app table server.
+
+Speaks the same WebSocket protocol PokerBot uses, so bots can be tested end
+to end on one machine:
+
+    in:  {"type": "join", "playerId", "name", "buyIn"}
+         {"type": "action", "playerId", "action", "amount"}
+    out: {"type": "players", "players": [...]}
+         {"type": "gameState", "state": {"communityCards", "pot", "currentBet", "currentRound", "players"}}
+         {"type": "privateState", "state": {"holeCards", "availableActions", "stackSize", "minRaise", "maxBet"}}
+         {"type": "handComplete", "winners": [{"playerId", "name", "amount"}]}
+
+Players are seated at the first table with a free seat (or the table named
+by an optional "tableId" in the join message), and every table plays its
+hands concurrently. A player who doesn't act within the timeout is checked
+or folded. The hold'em rules are the ones in engine.HeadlessTable.
+
+Usage:
+    python -m pokerbot.server --port 3004 --seats 6 --timeout 5
+then point PokerBot at it with SERVER_IP=127.0.0.1 / PORT=3004.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import websockets
+
+from pokerbot.engine import HeadlessTable, shuffled_deck
+
+ROUNDS = {0: "preflop", 3: "flop", 4: "turn", 5: "river"}
+# The only keys privateState carries; board, pot and bets come from gameState and
+# clients work out the table-model fields (engine.TABLE_FIELDS) themselves
+PRIVATE_FIELDS = ("holeCards", "availableActions", "stackSize", "minRaise", "maxBet")
+
+
+class Player:
+    def __init__(self, websocket, player_id, name, stack):
+        self.websocket = websocket
+        self.player_id = player_id
+        self.name = name
+        self.stack = stack
+        self.buy_in = stack
+        self.connected = True
+        self.actions = asyncio.Queue()
+        self.timeouts = 0
+        self.misacts = 0
+        self.disconnected_at = None  # time.monotonic() when the connection closed
+        self.latencies = []  # (time.monotonic() when privateState was sent, seconds until the action arrived)
+
+    async def send(self, message):
+        if not self.connected:
+            return
+        try:
+            await self.websocket.send(json.dumps(message))
+        except websockets.ConnectionClosed:
+            self.connected = False
+
+
+class Table:
+    """One table: seats players and plays hands until the server stops."""
+
+    def __init__(self, table_id, seats=6, action_timeout=5.0, hand_delay=0.5, small_blind=5, big_blind=10,
+                 rebuy=False, seed=None):
+        """
+        :param rebuy: Top busted players back up to their buy-in before each hand.
+        """
+        self.table_id = table_id
+        self.seats = seats
+        self.action_timeout = action_timeout
+        self.hand_delay = hand_delay
+        self.rebuy = rebuy
+        self.engine = HeadlessTable([], small_blind=small_blind, big_blind=big_blind)
+        self.rng = random.Random(seed)
+        self.players = []
+        self.in_hand = []  # Players dealt into the current hand, by engine seat
+        self.button = 0
+        self.hands_played = 0
+        self._seated = asyncio.Event()
+
+    def has_room(self):
+        return len(self.players) < self.seats
+
+    async def seat(self, player):
+        self.players.append(player)
+        self._seated.set()
+        await self.broadcast({"type": "players", "players": [self._player_summary(p) for p in self.players]})
+
+    async def broadcast(self, message):
+        await asyncio.gather(*(player.send(message) for player in self.players))
+
+    def _player_summary(self, player):
+        return {"playerId": player.player_id, "name": player.name, "stackSize": player.stack}
+
+    def _game_state(self, hand):
+        """The table-wide gameState message for the hand in progress."""
+        players = []
+        for player in self.players:
+            if player in self.in_hand:
+                seat = self.in_hand.index(player)
+                players.append({
+                    "playerId": player.player_id,
+                    "name": player.name,
+                    "stackSize": hand["stacks"][seat],
+                    "bet": hand["bets"][seat],
+                    "folded": hand["folded"][seat],
+                    "isCurrentActor": hand["actor"] == seat,
+                })
+            else:
+                # Sitting out this hand (busted or joined mid-hand)
+                players.append({"playerId": player.player_id, "name": player.name, "stackSize": player.stack,
+                                "bet": 0, "folded": True, "isCurrentActor": False})
+        return {
+            "type": "gameState",
+            "state": {
+                "communityCards": hand["board"],
+                "pot": sum(hand["committed"]),
+                "currentBet": hand["current_bet"],
+                "currentRound": ROUNDS.get(len(hand["board"]), "unknown"),
+                "button": self.in_hand[hand["button"]].player_id,
+                "players": players,
+            },
+        }
+
+    async def run(self):
+        while True:
+            self.players = [p for p in self.players if p.connected]
+            if sum(1 for p in self.players if p.stack > 0 or self.rebuy) < 2:
+                self._seated.clear()
+                await self._seated.wait()
+                continue
+            await self.play_hand()
+            await asyncio.sleep(self.hand_delay)
+
+    async def play_hand(self):
+        if self.rebuy:
+            for player in self.players:
+                if player.stack == 0:
+                    player.stack = player.buy_in
+        self.in_hand = [p for p in self.players if p.stack > 0]
+        n = len(self.in_hand)
+        self.button = self.button % n
+        deck = shuffled_deck(self.rng.getrandbits(64))
+        steps = self.engine.hand_steps(deck, self.button, [p.stack for p in self.in_hand])
+
+        try:
+            step = next(steps)
+            while True:
+                kind, seat, game_state, hand = step
+                if kind == "act":
+                    # Table state first: PokerBot reads the board and pot from it
+                    await self.broadcast(self._game_state(hand))
+                    step = steps.send(await self._request_action(self.in_hand[seat], game_state))
+                else:
+                    step = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+        await self.broadcast(self._game_state(hand))
+
+        winners = []
+        for player, stack, won, misacts in zip(self.in_hand, result["stacks"], result["winnings"],
+                                               result["misacts"]):
+            player.stack = stack
+            player.misacts += misacts
+            if won > 0:
+                winners.append({"playerId": player.player_id, "name": player.name, "amount": won})
+        await self.broadcast({"type": "handComplete", "winners": winners})
+
+        self.hands_played += 1
+        self.button = (self.button + 1) % n
+        self.in_hand = []
+
+    async def _request_action(self, player, game_state):
+        """Send privateState to the actor and wait (up to the timeout) for its action."""
+        # Drop anything the player sent out of turn
+        while not player.actions.empty():
+            player.actions.get_nowait()
+        sent = time.perf_counter()
+        sent_at = time.monotonic()
+        state = {key: game_state[key] for key in PRIVATE_FIELDS}
+        await player.send({"type": "privateState", "state": state})
+        if not player.connected:
+            return None
+        try:
+            move = await asyncio.wait_for(player.actions.get(), self.action_timeout)
+            if move is not None:
+                player.latencies.append((sent_at, time.perf_counter() - sent))
+            return move
+        except asyncio.TimeoutError:
+            player.timeouts += 1
+            print(f"[WARN] {self.table_id}: {player.name} timed out")
+            return None
+
+
+class TableServer:
+    def __init__(self, seats=6, action_timeout=5.0, hand_delay=0.5, rebuy=False, seed=None):
+        self.seats = seats
+        self.action_timeout = action_timeout
+        self.hand_delay = hand_delay
+        self.rebuy = rebuy
+        self.seed = seed
+        self.tables = {}
+        self.players = []  # Everyone who ever joined, for stats
+        self._tasks = []
+        self._table_ids = itertools.count(1)
+
+    def _open_table(self, table_id=None):
+        table_id = table_id or f"table-{next(self._table_ids)}"
+        seed = None if self.seed is None else f"{self.seed}:{table_id}"
+        table = Table(table_id, seats=self.seats, action_timeout=self.action_timeout,
+                      hand_delay=self.hand_delay, rebuy=self.rebuy, seed=seed)
+        self.tables[table_id] = table
+        self._tasks.append(asyncio.get_running_loop().create_task(table.run()))
+        return table
+
+    def _table_for(self, table_id=None):
+        if table_id is not None:
+            table = self.tables.get(table_id) or self._open_table(table_id)
+            return table if table.has_room() else None
+        for table in self.tables.values():
+            if table.has_room():
+                return table
+        return self._open_table()
+
+    async def handler(self, websocket):
+        table = None
+        player = None
+        try:
+            async for message in websocket:
+                try:
+                    data = json.loads(message)
+                except ValueError:
+                    continue
+                msg_type = data.get("type")
+                if msg_type == "join" and player is None:
+                    table = self._table_for(data.get("tableId"))
+                    if table is None:
+                        await websocket.send(json.dumps({"type": "error", "message": "Table is full"}))
+                        continue
+                    player = Player(websocket, data.get("playerId"), data.get("name", "?"),
+                                    int(data.get("buyIn", 1000)))
+                    self.players.append(player)
+                    await table.seat(player)
+                elif msg_type == "action" and player is not None:
+                    player.actions.put_nowait({"action": data.get("action"), "amount": data.get("amount", 0)})
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if player is not None:
+                player.connected = False
+                player.disconnected_at = time.monotonic()
+                # Wake a table that is waiting on this player
+                player.actions.put_nowait(None)
+
+    async def serve(self, host, port, duration=None, ready=None):
+        """
+        Accept players until cancelled, or for `duration` seconds if given.
+        :param ready: Called once the server is listening.
+        """
+        async with websockets.serve(self.handler, host, port, max_size=None):
+            print(f"[INFO] Table server listening on ws://{host}:{port}")
+            if ready is not None:
+                ready()
+            if duration is None:
+                await asyncio.Future()
+            await asyncio.sleep(duration)
+        for task in self._tasks:
+            task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local PokerBot-compatible table server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3004)
+    parser.add_argument("--seats", type=int, default=6, help="Players per table")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds a player has to act")
+    parser.add_argument("--hand-delay", type=float, default=0.5, help="Pause between hands (seconds)")
+    parser.add_argument("--rebuy", action="store_true", help="Top busted players back up to their buy-in")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = TableServer(seats=args.seats, action_timeout=args.timeout, hand_delay=args.hand_delay,
+                         rebuy=args.rebuy, seed=args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n[INFO] Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
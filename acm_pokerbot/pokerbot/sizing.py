@@ -0,0 +1,163 @@
+"""
+EV-maximizing bet sizing.
+
+For a bet/raise decision we:
+1. Sample opponent holdings and board run-outs once and rank them all in one
+   batch (see batch_eval). That gives our equity against each sampled
+   holding, and each holding's own strength on this board: its equity
+   against a random hand, i.e. what the opponent can judge without seeing
+   our cards.
+2. Score a grid of candidate sizes between minRaise and maxBet against that
+   same sample, using a fold-response model for how likely each holding is
+   to fold to each size.
+3. Smooth the EV curve over neighbouring sizes and return the smallest size
+   within `tolerance` of the best EV, plus the whole curve.
+
+Sizes are "raise to" totals like minRaise/maxBet. Chips we already have in
+front of us this round (game_state["ownBet"], from the table model) are
+not counted again, and the opponent is assumed to have put in currentBet.
+"""
+import numpy as np
+
+from pokerbot.batch_eval import card_indices, hand_parts, rank_parts, sample_deals
+
+
+class FoldModel:
+    """
+    Opponents defend with their strongest holdings: facing a bet of B into a
+    pot of P they keep the top P / (P + B) (the minimum defence frequency) and
+    fold the rest. `softness` blurs that cut-off (in strength percentiles)
+    and `stickiness` is the share of holdings that call regardless, which
+    shrinks along with the defence frequency as the bet grows.
+    """
+
+    def __init__(self, softness=0.08, stickiness=0.1):
+        self.softness = softness
+        self.stickiness = stickiness
+
+    def fold_probability(self, strength, defend):
+        """
+        (C, K) fold chances for K holdings facing C sizes.
+        :param strength: (K,) strength percentile of each holding (1 = strongest).
+        :param defend: (C,) share of holdings that defend against each size.
+        """
+        gap = ((1 - defend)[:, None] - strength[None, :]) / max(self.softness, 1e-6)
+        call_anyway = self.stickiness * defend[:, None]
+        return (1 - call_anyway) / (1 + np.exp(-gap))
+
+
+class BetSizer:
+    def __init__(self, candidates=48, holdings=512, runouts=16, smoothing=5, tolerance=0.05, fold_model=None, seed=None):
+        """
+        :param candidates: Number of sizes tried between minRaise and maxBet.
+        :param holdings: Opponent hands sampled for the equity distribution.
+        :param runouts: Board run-outs, shared by all sampled holdings.
+        :param smoothing: Sizes averaged (centered) into each point of the EV curve.
+        :param tolerance: Share of the pot; the smallest size within this of the best EV wins.
+        """
+        self.candidates = candidates
+        self.holdings = holdings
+        self.runouts = runouts
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.fold_model = fold_model or FoldModel()
+        self.rng = np.random.default_rng(seed)
+        self._cache_key = None
+        self._cache = None
+
+    def equity_distribution(self, hole_cards, community_cards):
+        """
+        (equity, strength) arrays over the sampled opponent holdings: our
+        equity against each, and each holding's strength percentile against
+        a random hand on this board (0-1, 1 = strongest).
+        Cached for the last (hole, board) so repeat calls within a decision are free.
+        """
+        key = (tuple(card_indices(hole_cards)), tuple(card_indices(community_cards)))
+        if key == self._cache_key:
+            return self._cache
+
+        hole, board = list(key[0]), list(key[1])
+        missing = 5 - len(board)
+        runouts = self.runouts if missing else 1
+        # One set of run-outs shared by every holding, so on each run-out the holdings
+        # can be ranked against each other; pairs that reuse a card are masked out
+        opp = sample_deals(self.rng, hole + board, self.holdings, 2)
+        runout = sample_deals(self.rng, hole + board, runouts, missing)
+        valid = ~(opp[:, None, :, None] == runout[None, :, None, :]).any(axis=(2, 3))
+        known = np.broadcast_to(np.asarray(board, dtype=np.int64), (runouts, len(board)))
+        board_counts, board_suits = hand_parts(np.hstack([known, runout]))
+        hole_counts, hole_suits = hand_parts([hole])
+        opp_counts, opp_suits = hand_parts(opp)
+        ours = rank_parts(hole_counts + board_counts, hole_suits + board_suits)
+        # OR rather than add the suit masks: masked pairs may share a card
+        theirs = rank_parts((opp_counts[:, None] + board_counts[None]).reshape(-1, 13),
+                            (opp_suits[:, None] | board_suits[None]).reshape(-1, 4))
+        theirs = theirs.reshape(self.holdings, runouts)
+
+        weight = valid / np.maximum(valid.sum(axis=1, keepdims=True), 1)
+        outcome = np.where(ours[None] > theirs, 1.0, np.where(ours[None] == theirs, 0.5, 0.0))
+        equity = (outcome * weight).sum(axis=1)
+        # Strength: share of the other sampled holdings beaten on the same run-out
+        beaten = np.zeros_like(outcome)
+        for column in range(runouts):
+            live = np.sort(theirs[valid[:, column], column])
+            below = np.searchsorted(live, theirs[:, column], side="left")
+            tied = np.searchsorted(live, theirs[:, column], side="right") - below - 1
+            beaten[:, column] = (below + tied / 2) / max(len(live) - 1, 1)
+        strength = (beaten * weight).sum(axis=1)
+        # As percentiles, so the fold model can cut at a defence frequency
+        order = np.argsort(strength, kind="stable")
+        percentile = np.empty(self.holdings)
+        percentile[order] = (np.arange(self.holdings) + 0.5) / self.holdings
+
+        self._cache_key, self._cache = key, (equity, percentile)
+        return self._cache
+
+    def solve(self, game_state, opponents=1, distribution=None):
+        """
+        Find the EV-maximizing bet/raise size for the decision in `game_state`.
+        :param opponents: Players who could call; treated as independent.
+        :param distribution: A precomputed equity_distribution() to reuse.
+        Returns {"amount", "ev", "sizes", "evs", "check_ev"} with EVs in chips
+        (evs is the smoothed curve the amount was picked from).
+        """
+        pot = game_state.get("pot", 0)
+        current_bet = game_state.get("currentBet", 0)
+        own_bet = game_state.get("ownBet", 0)
+        min_raise = game_state.get("minRaise", 0)
+        max_bet = game_state.get("maxBet", 0)
+        if distribution is None:
+            distribution = self.equity_distribution(game_state.get("holeCards", []),
+                                                    game_state.get("communityCards", []))
+        equity, strength = distribution
+
+        low = max(min_raise, 1)
+        high = max(max_bet, low)
+        sizes = np.unique(np.linspace(low, high, self.candidates).astype(np.int64))
+
+        # What we add, what the opponent must add to call, and the pot if they do
+        cost = np.maximum(sizes - own_bet, 0).astype(float)
+        to_call = np.maximum(sizes - current_bet, 0).astype(float)
+        final_pot = pot + cost + to_call
+        defend = np.where(pot + cost > 0, pot / np.maximum(pot + cost, 1e-9), 1.0)
+
+        folds = self.fold_model.fold_probability(strength, defend)
+        # Several opponents: everyone must fold, and we must beat all callers
+        all_fold = folds ** opponents
+        win_share = equity[None, :] ** opponents
+        called_ev = win_share * final_pot[:, None] - cost[:, None]
+        evs = (all_fold * pot + (1 - all_fold) * called_ev).mean(axis=1)
+        if self.smoothing > 1 and len(evs) > 1:
+            width = min(self.smoothing, len(evs))
+            padded = np.pad(evs, (width // 2, width - 1 - width // 2), mode="edge")
+            evs = np.convolve(padded, np.ones(width) / width, mode="valid")
+
+        # The curve flattens out for big sizes, so don't risk more for EV within the noise
+        best = int(np.argmax(evs >= evs.max() - self.tolerance * max(pot, 1)))
+        return {
+            "amount": int(sizes[best]),
+            "ev": float(evs[best]),
+            "sizes": sizes,
+            "evs": evs,
+            "check_ev": float((equity ** opponents).mean() * pot),
+        }
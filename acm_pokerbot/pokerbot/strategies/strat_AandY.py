@@ -40,6 +40,32 @@ PLAYABLE_HANDS = [
     {"K", "8"}, {"K", "7"}, {"K", "6"}, {"Q", "10"}, {"Q", "9"}
 ]
 
+
+def _classify_preflop(ranks, is_suited):
+    """Pre-flop class (see evaluate_preflop_hand) of a set of hole-card ranks."""
+    # Check if we have a pocket pair
+    is_pocket_pair = len(ranks) == 1
+
+    # Check if our hand is in one of the predefined categories
+    if ranks in PREMIUM_HANDS or (is_pocket_pair and any(r in ['A', 'K', 'Q', 'J', '10'] for r in ranks)):
+        return 3
+
+    if ranks in STRONG_HANDS or (is_suited and ranks in PREMIUM_HANDS):
+        return 2
+
+    if ranks in PLAYABLE_HANDS or (is_suited and ranks in STRONG_HANDS):
+        return 1
+
+    return 0
+
+
+# Every starting hand's class, keyed by (frozenset of ranks, suited). Built once
+# per process and only read afterwards, so all strategy instances share it.
+PREFLOP_CHART = {
+    (frozenset((a, b)), is_suited): _classify_preflop({a, b}, is_suited)
+    for a in CARD_VALUES for b in CARD_VALUES for is_suited in (False, True)
+}
+
 # Hand strength ranking
 HAND_STRENGTH = {
     "High Card": 1,
@@ -54,18 +80,55 @@ HAND_STRENGTH = {
     "Royal Flush": 10
 }
 
+# Tunable constants (see pokerbot/tuning.py). The base aggression/bluff values
+# are the tight-aggressive defaults; the short/deep values kick in when the
+# stack drops below / grows above the given ratio of the initial stack.
+DEFAULT_PARAMS = {
+    "aggression_factor": 0.7,
+    "bluff_frequency": 0.15,
+    "min_stack_for_bluff": 400,
+    "pot_percentage": {
+        0: 0.5,  # Weak hands - small bets
+        1: 0.75, # Playable hands
+        2: 1.0,  # Strong hands
+        3: 1.5   # Premium hands
+    },
+    "short_stack_ratio": 0.3,
+    "short_aggression_factor": 0.3,
+    "short_bluff_frequency": 0.05,
+    "deep_stack_ratio": 1.5,
+    "deep_aggression_factor": 0.9,
+    "deep_bluff_frequency": 0.2,
+    "ev_sizing": False,  # Use the EV solver in pokerbot/sizing.py instead of the pot_percentage map
+    "hand_potential": False,  # On the flop/turn, use effective hand strength from pokerbot/potential.py
+}
+
 class PokerStrategy:
-    def __init__(self):
+    def __init__(self, params=None, seed=None):
+        """
+        :param params: Optional overrides for DEFAULT_PARAMS.
+        :param seed: Optional seed for this strategy's random decisions.
+        """
+        self.params = dict(DEFAULT_PARAMS)
+        self.params["pot_percentage"] = dict(DEFAULT_PARAMS["pot_percentage"])
+        for key, value in (params or {}).items():
+            if key == "pot_percentage":
+                self.params[key].update(value)
+            else:
+                self.params[key] = value
+        self.rng = random.Random(seed)  # Own RNG so runs can be replayed
         self.hand_history = []  # Track previous hands
         self.round_history = []  # Track betting in current hand
         self.player_profiles = {}  # Track tendencies of other players
         self.position = None  # Early, middle, late
         self.hand_count = 0
         self.initial_stack = 1000  # Assume starting with 1000 chips
-        self.aggression_factor = 0.7  # Adjustable parameter (0-1), higher = more aggressive
-        self.bluff_frequency = 0.15  # How often to bluff (0-1)
-        self.min_stack_for_bluff = 400  # Don't bluff if stack is below this
+        self.aggression_factor = self.params["aggression_factor"]  # Adjustable parameter (0-1), higher = more aggressive
+        self.bluff_frequency = self.params["bluff_frequency"]  # How often to bluff (0-1)
+        self.min_stack_for_bluff = self.params["min_stack_for_bluff"]  # Don't bluff if stack is below this
         self.playing_style = "tight-aggressive"  # Default playing style
+        self.bet_sizer = None  # Created on first use when ev_sizing is on
+        self.potential = None  # Created on first use when hand_potential is on
 
     def update_hand_history(self, game_state, action_taken):
         """Track hands played and their outcomes"""
@@ -101,26 +164,9 @@ class PokerStrategy:
         if not hole_cards or len(hole_cards) != 2:
             return 0
         
-        ranks = {card['_rank'] for card in hole_cards}
-        suits = {card['_suit'] for card in hole_cards}
-        
-        # Check if we have a pocket pair
-        is_pocket_pair = len(ranks) == 1
-        
-        # Check if hand is suited
-        is_suited = len(suits) == 1
-        
-        # Check if our hand is in one of the predefined categories
-        if ranks in PREMIUM_HANDS or (is_pocket_pair and any(r in ['A', 'K', 'Q', 'J', '10'] for r in ranks)):
-            return 3
-        
-        if ranks in STRONG_HANDS or (is_suited and ranks in PREMIUM_HANDS):
-            return 2
-        
-        if ranks in PLAYABLE_HANDS or (is_suited and ranks in STRONG_HANDS):
-            return 1
-            
-        return 0
+        ranks = frozenset(card['_rank'] for card in hole_cards)
+        is_suited = hole_cards[0]['_suit'] == hole_cards[1]['_suit']
+        return PREFLOP_CHART.get((ranks, is_suited), 0)  # Unknown ranks count as weak
 
     def calculate_pot_odds(self, pot, current_bet):
         """Calculate pot odds (ratio of what you can win vs what you must bet)"""
@@ -128,10 +174,11 @@ class PokerStrategy:
             return float('inf')  # No bet to call, so odds are infinite
         return pot / current_bet
 
-    def calculate_win_probability(self, hole_cards, community_cards, hand_type):
+    def calculate_win_probability(self, hole_cards, community_cards, hand_type, opponents=1):
         """
         Estimate probability of winning based on current hand type
         This is a simplified version - in a real implementation, you'd use more complex algorithms
+        :param opponents: Active opponents; we have to beat all of them.
         """
         hand_strength = HAND_STRENGTH.get(hand_type, 0)
         
@@ -159,12 +206,20 @@ class PokerStrategy:
         }
         
         current_stage = self._determine_stage(community_cards)
+
+        # Effective hand strength counts draws, which the hand type alone misses
+        if self.params["hand_potential"] and current_stage in ("flop", "turn"):
+            if self.potential is None:
+                from pokerbot.potential import HandPotential
+                self.potential = HandPotential(seed=self.rng.getrandbits(32))
+            # Against several opponents we have to beat them all
+            return self.potential.evaluate(hole_cards, community_cards)["ehs"] ** opponents
         
-        # Apply adjustments
-        win_prob = base_probs[hand_strength] * stage_adjustment[current_stage]
+        # Apply adjustments (the base chances are against one opponent)
+        win_prob = (base_probs[hand_strength] * stage_adjustment[current_stage]) ** opponents
         
         # Add a small random variation to make behavior less predictable
-        win_prob = min(0.99, max(0.01, win_prob + random.uniform(-0.05, 0.05)))
+        win_prob = min(0.99, max(0.01, win_prob + self.rng.uniform(-0.05, 0.05)))
         
         return win_prob
 
@@ -185,39 +240,44 @@ class PokerStrategy:
         adjusted_bluff_freq = self.bluff_frequency * position_factor
         
         # Randomly decide whether to bluff
-        return random.random() < adjusted_bluff_freq
+        return self.rng.random() < adjusted_bluff_freq
 
     def determine_position(self, game_state):
         """
         Determine position at the table
-        This is a simplified version since we don't have complete table information
+        PokerBot and HeadlessTable work it out from the seats and button (see
+        pokerbot/table_model.py); without that we can only guess
         """
-        # In a real implementation, you'd track all players and know exact positions
-        # Here we're making a guess based on when our bot acts
+        if game_state.get("position") is not None:
+            self.position = game_state["position"]
+            return
+
+        # No table information: make a guess
         players = game_state.get("players", [])
         total_players = sum(1 for p in players if p is not None)
         
         if total_players <= 3:
             self.position = "late"  # In a small game, positions are less relevant
-        elif random.random() < 0.33:
+        elif self.rng.random() < 0.33:
             self.position = "early"
-        elif random.random() < 0.5:
+        elif self.rng.random() < 0.5:
             self.position = "middle"
         else:
             self.position = "late"
 
-    def determine_bet_size(self, hand_strength, pot, stack_size, min_raise, max_bet, win_probability):
+    def determine_bet_size(self, hand_strength, pot, stack_size, min_raise, max_bet, win_probability, game_state=None):
         """
         Determine bet size based on hand strength, pot size, and stack size
         Returns an amount between min_raise and max_bet
         """
+        if self.params["ev_sizing"] and game_state is not None:
+            if self.bet_sizer is None:
+                from pokerbot.sizing import BetSizer
+                self.bet_sizer = BetSizer(seed=self.rng.getrandbits(32))
+            return self.bet_sizer.solve(game_state, opponents=game_state.get("activeOpponents", 1))["amount"]
+
         # Base bet as a percentage of the pot
-        pot_percentage = {
-            0: 0.5,  # Weak hands - small bets
-            1: 0.75, # Playable hands
-            2: 1.0,  # Strong hands
-            3: 1.5   # Premium hands
-        }
+        pot_percentage = self.params["pot_percentage"]
         
         # Adjust based on win probability
         bet_multiplier = win_probability * 2
@@ -233,21 +293,22 @@ class PokerStrategy:
 
     def adjust_strategy(self, stack_size):
         """Adjust strategy based on stack size"""
+        params = self.params
         # If we're short stacked, play more conservatively
-        if stack_size < self.initial_stack * 0.3:
+        if stack_size < self.initial_stack * params["short_stack_ratio"]:
             self.playing_style = "tight-conservative"
-            self.aggression_factor = 0.3
-            self.bluff_frequency = 0.05
+            self.aggression_factor = params["short_aggression_factor"]
+            self.bluff_frequency = params["short_bluff_frequency"]
         # If we have a large stack, play more aggressively
-        elif stack_size > self.initial_stack * 1.5:
+        elif stack_size > self.initial_stack * params["deep_stack_ratio"]:
             self.playing_style = "loose-aggressive"
-            self.aggression_factor = 0.9
-            self.bluff_frequency = 0.2
+            self.aggression_factor = params["deep_aggression_factor"]
+            self.bluff_frequency = params["deep_bluff_frequency"]
         # Default to tight-aggressive
         else:
             self.playing_style = "tight-aggressive"
-            self.aggression_factor = 0.7
-            self.bluff_frequency = 0.15
+            self.aggression_factor = params["aggression_factor"]
+            self.bluff_frequency = params["bluff_frequency"]
 
     def strat_action(self, game_state):
         """
@@ -293,7 +354,8 @@ class PokerStrategy:
             hand_strength = HAND_STRENGTH.get(hand_type, 1) / 3  # Scale to 0-3 range
             
         # Calculate win probability
-        win_probability = self.calculate_win_probability(hole_cards, community_cards, hand_type)
+        win_probability = self.calculate_win_probability(hole_cards, community_cards, hand_type,
+                                                         game_state.get("activeOpponents", 1))
         
         # Calculate pot odds
         pot_odds = self.calculate_pot_odds(pot, current_bet)
@@ -302,10 +364,10 @@ class PokerStrategy:
         if current_stage == "pre-flop":
             if hand_strength >= 2:  # Premium or strong hand
                 if "raise" in available_actions:
-                    bet_amount = self.determine_bet_size(hand_strength, pot, stack_size, min_raise, max_bet, win_probability)
+                    bet_amount = self.determine_bet_size(hand_strength, pot, stack_size, min_raise, max_bet, win_probability, game_state)
                     return {"action": "raise", "amount": bet_amount}
                 elif "bet" in available_actions:
-                    bet_amount = self.determine_bet_size(hand_strength, pot, stack_size, min_raise, max_bet, win_probability)
+                    bet_amount = self.determine_bet_size(hand_strength, pot, stack_size, min_raise, max_bet, win_probability, game_state)
                     return {"action": "bet", "amount": bet_amount}
                 elif "call" in available_actions:
                     return {"action": "call", "amount": 0}
@@ -340,10 +402,10 @@ class PokerStrategy:
             # For very strong hands, be aggressive
             if hand_strength >= 6/3:  # Flush or better
                 if "raise" in available_actions:
-                    bet_amount = self.determine_bet_size(3, pot, stack_size, min_raise, max_bet, win_probability)
+                    bet_amount = self.determine_bet_size(3, pot, stack_size, min_raise, max_bet, win_probability, game_state)
                     return {"action": "raise", "amount": bet_amount}
                 elif "bet" in available_actions:
-                    bet_amount = self.determine_bet_size(3, pot, stack_size, min_raise, max_bet, win_probability)
+                    bet_amount = self.determine_bet_size(3, pot, stack_size, min_raise, max_bet, win_probability, game_state)
                     return {"action": "bet", "amount": bet_amount}
                 elif "call" in available_actions:
                     return {"action": "call", "amount": 0}
@@ -354,10 +416,10 @@ class PokerStrategy:
             elif hand_strength >= 3/3:  # Three of a kind or better
                 if win_probability > 0.6:
                     if "raise" in available_actions:
-                        bet_amount = self.determine_bet_size(2, pot, stack_size, min_raise, max_bet, win_probability)
+                        bet_amount = self.determine_bet_size(2, pot, stack_size, min_raise, max_bet, win_probability, game_state)
                         return {"action": "raise", "amount": bet_amount}
                     elif "bet" in available_actions:
-                        bet_amount = self.determine_bet_size(2, pot, stack_size, min_raise, max_bet, win_probability)
+                        bet_amount = self.determine_bet_size(2, pot, stack_size, min_raise, max_bet, win_probability, game_state)
                         return {"action": "bet", "amount": bet_amount}
                 
                 # Otherwise call or check
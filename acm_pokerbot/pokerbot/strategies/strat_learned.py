@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+
+from pokerbot.batch_eval import card_indices
+from pokerbot.model import (ACTIONS, FEATURES, MODEL_PATH, PolicyValueNet, batch_equity, features, legal_mask,
+                            to_move, update_aggression)
+from pokerbot.strategies import strat_AandY
+
+LEARNED_PARAMS = {
+    "model": MODEL_PATH,  # Weights written by `python -m pokerbot.training`
+    "equity_samples": 128,
+    "greedy": False,  # Always take the most likely action instead of sampling
+    "aggression_memory": 0.95,  # Decay of the opponent aggression average
+}
+
+# Weights are read-only, so every instance shares one network per file
+_networks = {}
+
+# Pre-flop equity only depends on the two ranks and whether they're suited,
+# so it's estimated once per starting hand and shared by every instance
+_preflop_equity = {}
+
+
+def load_network(path):
+    """The network saved at `path`, or None (with a warning) if there isn't one."""
+    if path not in _networks:
+        if os.path.exists(path):
+            _networks[path] = PolicyValueNet.load(path)
+        else:
+            print(f"[WARN] No model at {path}; falling back to the rule-based strategy")
+            _networks[path] = None
+    return _networks[path]
+
+
+def preflop_equity(hole, opponents=1):
+    """Equity of two hole-card ints against random hands, memoized per starting hand."""
+    key = (max(hole) // 4, min(hole) // 4, hole[0] % 4 == hole[1] % 4, opponents)
+    if key not in _preflop_equity:
+        _preflop_equity[key] = batch_equity([hole], [[]], samples=2000, rng=np.random.default_rng(0),
+                                            opponents=opponents)[0]
+    return _preflop_equity[key]
+
+
+class PokerStrategy(strat_AandY.PokerStrategy):
+    """strat_AandY with the rule cascades replaced by a learned policy (see pokerbot/model.py)."""
+
+    def __init__(self, params=None, seed=None):
+        super().__init__(params=dict(LEARNED_PARAMS, **(params or {})), seed=seed)
+        self.net = load_network(self.params["model"])
+        self.opponent_aggression = 0.5
+        self.last_probabilities = None
+        self.last_value = None
+        self._features = np.zeros(len(FEATURES))
+
+    def strat_action(self, game_state):
+        if self.net is None:
+            return super().strat_action(game_state)
+
+        hole_cards = game_state.get("holeCards", [])
+        community_cards = game_state.get("communityCards", [])
+        available_actions = game_state.get("availableActions", [])
+        if not community_cards:
+            self.hand_count += 1
+        self.determine_position(game_state)
+        self.adjust_strategy(game_state.get("stackSize", 0))
+        if not available_actions:
+            return {"action": "fold", "amount": 0}
+
+        hole = card_indices(hole_cards)
+        opponents = max(game_state.get("activeOpponents", 1), 1)
+        if community_cards:
+            rng = np.random.default_rng(self.rng.getrandbits(32))
+            equity = batch_equity([hole], [card_indices(community_cards)], samples=self.params["equity_samples"],
+                                  rng=rng, opponents=opponents)[0]
+        else:
+            equity = preflop_equity(hole, opponents)
+        pot_odds = self.calculate_pot_odds(game_state.get("pot", 0), game_state.get("currentBet", 0))
+        x = features(game_state, equity, pot_odds, self.position, opponents, self.opponent_aggression,
+                     out=self._features)
+
+        probabilities, self.last_value = self.net.predict_one(x, legal_mask(available_actions))
+        self.last_probabilities = dict(zip(ACTIONS, probabilities.tolist()))
+        if self.params["greedy"]:
+            action = int(np.argmax(probabilities))
+        else:
+            action = int(np.searchsorted(np.cumsum(probabilities), self.rng.random() * probabilities.sum()))
+            action = min(action, len(ACTIONS) - 1)
+
+        self.opponent_aggression = update_aggression(self.opponent_aggression, game_state,
+                                                     self.params["aggression_memory"])
+        return to_move(action, game_state)
+
+
+# Create the strategy instance
+strategy = PokerStrategy()
+
+
+# Function to be called from the PokerBot
+def strat_action(game_state):
+    action = strategy.strat_action(game_state)
+
+    formatted_hole = [f"{card['_rank']}{card['_suit']}" for card in game_state.get("holeCards", [])]
+    formatted_community = [f"{card['_rank']}{card['_suit']}" for card in game_state.get("communityCards", [])]
+    print("\n=== Learned Strategy ===")
+    print(f"Hole Cards: {formatted_hole}")
+    print(f"Community Cards: {formatted_community}")
+    print(f"Position: {strategy.position}")
+    print(f"Policy: {strategy.last_probabilities}")
+    print(f"Action: {action['action']} (Amount: {action['amount']})")
+
+    strategy.update_hand_history(game_state, action)
+    return action
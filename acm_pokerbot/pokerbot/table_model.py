@@ -0,0 +1,198 @@
+"""
+Incremental model of the table, built from gameState messages.
+
+gameState.players lists everyone in seat order with stackSize, bet, folded
+and isCurrentActor. TableModel keeps:
+
+  - seat order (rebuilt only when someone joins or leaves), keyed by
+    playerId (or id / name when a server leaves it out),
+  - our own seat: matched on our player id or name, or else taken from
+    isCurrentActor when privateState says it's our turn (identify_actor),
+  - the button, from gameState.button when the server sends it, otherwise
+    from where the blinds were posted, otherwise moved one seat per hand,
+  - who was dealt in, who is still active (not folded) and their stacks.
+
+From these it derives the fields PokerBot adds to the game_state it hands
+to strategies (see fields()): position, activeOpponents, effectiveStack,
+playersInHand and ownBet.
+"""
+POSITIONS = ("early", "middle", "late")
+
+
+def _player_key(player, seat):
+    """Stable key for a gameState player: playerId (or id / name), else the seat index."""
+    for field in ("playerId", "id", "name"):
+        if player.get(field) is not None:
+            return player[field]
+    return seat
+
+
+def seat_position(seat, button, players):
+    """early/middle/late for `seat`, by how many players act after it post-flop."""
+    if players <= 3:
+        return "late"
+    after = (button - seat) % players  # 0 on the button
+    if after <= 1:
+        return "late"
+    return "middle" if after <= players // 2 else "early"
+
+
+class TableModel:
+    def __init__(self, player_id, name=None):
+        self.player_id = player_id
+        self.name = name
+        self.ids = ()  # Player keys (see _player_key) in seat order
+        self.seat_of = {}
+        self.names = {}  # Seat by player name
+        self.actor = None  # Seat of the isCurrentActor player in the latest gameState
+        self.own_key = None  # Our key, learned from isCurrentActor when id and name don't match
+        self.stacks = []
+        self.bets = []
+        self.folded = []
+        self.in_hand = []  # Seats dealt into the current hand
+        self.start_stacks = {}  # Player key -> chips at the start of the current hand
+        self.last_stack = None  # Our stack when the previous hand finished
+        self.button = None  # Seat index
+        self.hands = 0
+        self._new_hand = True
+        self._board_size = 0
+
+    def update(self, state):
+        """Fold one gameState "state" dict into the model."""
+        players = [p for p in state.get("players", []) if p is not None]
+        ids = tuple(_player_key(p, seat) for seat, p in enumerate(players))
+        if ids != self.ids:
+            self._reseat(ids)
+            self.names = {p.get("name"): seat for seat, p in enumerate(players)}
+        self.actor = next((seat for seat, p in enumerate(players) if p.get("isCurrentActor")), None)
+
+        for seat, player in enumerate(players):
+            self.stacks[seat] = player.get("stackSize", 0)
+            self.bets[seat] = player.get("bet", 0)
+            self.folded[seat] = bool(player.get("folded"))
+
+        board_size = len(state.get("communityCards", []))
+        if board_size < self._board_size:
+            self._new_hand = True  # Missed the handComplete; the board was cleared
+        self._board_size = board_size
+        if self._new_hand and players:
+            self._start_hand(state.get("button"))
+
+    def finish_hand(self, winnings=0):
+        """Call on handComplete with what we won; the next gameState starts a new hand."""
+        seat = self.seat
+        self.last_stack = self.stacks[seat] + winnings if seat is not None and seat in self.in_hand else None
+        self._new_hand = True
+
+    def identify_actor(self):
+        """Call on privateState: it's our turn, so the current actor is us."""
+        if self.actor is not None:
+            self.own_key = self.ids[self.actor]
+
+    def _reseat(self, ids):
+        """Someone joined or left: rebuild the seat index, keeping the hand's players and button."""
+        in_hand = [self.ids[seat] for seat in self.in_hand]
+        button = self.ids[self.button] if self.button is not None else None
+        self.ids = ids
+        self.seat_of = {player_id: seat for seat, player_id in enumerate(ids)}
+        self.stacks = [0] * len(ids)
+        self.bets = [0] * len(ids)
+        self.folded = [False] * len(ids)
+        self.in_hand = [self.seat_of[player_id] for player_id in in_hand if player_id in self.seat_of]
+        self.button = self.seat_of.get(button)
+
+    def _start_hand(self, button_id):
+        self._new_hand = False
+        self.hands += 1
+        me = self.seat
+        carried = self.last_stack or None  # 0 means we busted, so any chips now are a new buy-in
+        # An all-in seat shows no stack and no bet once the board runs out, so count
+        # ourselves in whenever we carried chips over from the last hand
+        self.in_hand = [seat for seat in range(len(self.ids)) if not self.folded[seat]
+                        and (self.stacks[seat] > 0 or self.bets[seat] > 0 or (seat == me and carried))]
+        if self._board_size == 0:
+            # Only the blinds are in before the flop, so stack + bet is what each seat started with
+            self.start_stacks = {self.ids[seat]: self.stacks[seat] + self.bets[seat] for seat in self.in_hand}
+        else:
+            # First seen after the flop (all-in from the blinds): only our own start is known
+            self.start_stacks = {self.ids[me]: carried} if me is not None and carried else {}
+        if button_id is not None and button_id in self.seat_of:
+            self.button = self.seat_of[button_id]
+        else:
+            self.button = self._button_from_blinds()
+
+    def _button_from_blinds(self):
+        """Button seat implied by the blinds, else the previous button moved on one seat."""
+        n = len(self.in_hand)
+        if n >= 2:
+            posted = [seat for seat in self.in_hand if self.bets[seat] > 0]
+            if len(posted) == 2:
+                small, big = sorted(posted, key=lambda seat: self.bets[seat])
+                i = self.in_hand.index(small)
+                if self.in_hand[(i + 1) % n] == big and self.bets[small] < self.bets[big]:
+                    # Heads-up the button posts the small blind
+                    return small if n == 2 else self.in_hand[(i - 1) % n]
+        if self.button is None:
+            return self.in_hand[0] if self.in_hand else None
+        later = [seat for seat in self.in_hand if seat > self.button]
+        return later[0] if later else (self.in_hand[0] if self.in_hand else None)
+
+    @property
+    def seat(self):
+        """Our seat index, or None while we can't tell which player we are."""
+        if self.player_id in self.seat_of:
+            return self.seat_of[self.player_id]
+        if self.name is not None and self.name in self.names:
+            return self.names[self.name]
+        return self.seat_of.get(self.own_key)
+
+    def dealt_in(self):
+        """Whether we were dealt into the current hand."""
+        return self.seat in self.in_hand
+
+    def net(self, winnings=0):
+        """
+        Our chip result for the hand: the last stack we saw plus `winnings`
+        (from handComplete), minus what we started with. None if unknown.
+        """
+        seat = self.seat
+        if seat is None or self.ids[seat] not in self.start_stacks:
+            return None
+        return self.stacks[seat] + winnings - self.start_stacks[self.ids[seat]]
+
+    def active_opponents(self):
+        live = [seat for seat in self.in_hand if not self.folded[seat]]
+        seat = self.seat
+        if seat is None:
+            # Which seat is ours is unknown, but we're one of the live players
+            return max(len(live) - 1, 0)
+        return sum(1 for other in live if other != seat)
+
+    def effective_stack(self, stack=None):
+        """Our stack (or `stack`, e.g. from privateState) capped by the deepest active opponent's."""
+        seat = self.seat
+        if stack is None:
+            stack = self.stacks[seat] if seat is not None else 0
+        others = [self.stacks[other] for other in self.in_hand if not self.folded[other] and other != seat]
+        return min(stack, max(others)) if others else stack
+
+    def own_bet(self):
+        """Chips we already have in front of us this betting round (0 if our seat is unknown)."""
+        seat = self.seat
+        return self.bets[seat] if seat is not None else 0
+
+    def position(self):
+        seat = self.seat
+        if seat not in self.in_hand or self.button not in self.in_hand:
+            return None
+        return seat_position(self.in_hand.index(seat), self.in_hand.index(self.button), len(self.in_hand))
+
+    def fields(self, stack=None):
+        """The precomputed game_state fields for strategies."""
+        return {
+            "position": self.position(),
+            "activeOpponents": self.active_opponents(),
+            "effectiveStack": self.effective_stack(stack),
+            "playersInHand": len(self.in_hand),
+            "ownBet": self.own_bet(),
+        }
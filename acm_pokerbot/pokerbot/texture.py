@@ -0,0 +1,206 @@
+"""
+Precomputed board-texture index for every flop, turn and river.
+
+Boards that only differ by a relabelling of suits have the same texture, so
+features are computed once per suit-isomorphic board (1,755 flops, 16,432
+turns, 134,459 rivers). Turn and river boards are built by extending the
+flop set one card at a time. For each street two .npy files are written:
+
+  <street>_rows.npy      uint32, colex rank of the sorted board -> feature row
+  <street>_features.npy  uint8 (rows, len(FEATURES)) texture table
+
+Both are opened memory-mapped, so looking up the live communityCards is
+O(1): rank the sorted card ints, read one row.
+
+Features:
+  max_rank_count  1 unpaired, 2 paired, 3 trips, 4 quads on board
+  pairs           number of paired ranks on the board
+  max_suit        most cards of one suit (3 on a flop = monotone)
+  suits           number of different suits
+  flush_possible  1 if two hole cards can make a flush
+  straight_made   1 if the board itself is a straight
+  straight_combos rank pairs that complete a straight with the board
+  connected       most board ranks inside any 5-rank window
+  nut_class       best category any holding can make (HAND_CATEGORIES index)
+  draw_density    % of holdings with a flush or straight draw (0 on the river)
+
+Build with `python -m pokerbot.texture` (~15s) before playing. pokerbot/data/
+isn't checked in, and a lookup never builds the index itself: that would
+blow well past the action timeout mid-decision.
+"""
+import itertools
+import os
+from math import comb
+
+import numpy as np
+
+from pokerbot.batch_eval import _POPCOUNT, _STRAIGHT, card_indices
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+STREETS = {3: "flop", 4: "turn", 5: "river"}
+FEATURES = (
+    "max_rank_count", "pairs", "max_suit", "suits", "flush_possible", "straight_made",
+    "straight_combos", "connected", "nut_class", "draw_density",
+)
+
+# Windows of five consecutive ranks, ace-low first
+_WINDOWS = [(1 << 12) | 0b1111] + [0b11111 << low for low in range(9)]
+
+
+def colex_rank(cards):
+    """Position of a sorted combination in colexicographic order."""
+    return sum(comb(card, i + 1) for i, card in enumerate(sorted(cards)))
+
+
+def _colex_ranks(boards):
+    """Vectorized colex_rank for an (N, k) array of sorted card ints."""
+    k = boards.shape[1]
+    table = np.array([[comb(c, i + 1) for i in range(k)] for c in range(52)], dtype=np.int64)
+    return table[boards, np.arange(k)].sum(axis=1)
+
+
+def _suit_masks(boards):
+    """(N, 4) rank bit masks, one per suit."""
+    masks = np.zeros((boards.shape[0], 4), dtype=np.int64)
+    for column in boards.T:
+        masks[np.arange(boards.shape[0]), column % 4] |= 1 << (column // 4)
+    return masks
+
+
+def _straight_combo_table():
+    """Rank pairs (a <= b) that turn each 13-bit rank mask into a straight."""
+    masks = np.arange(1 << 13)
+    counts = np.zeros(1 << 13, dtype=np.int64)
+    for a in range(13):
+        for b in range(a, 13):
+            counts += _STRAIGHT[masks | (1 << a) | (1 << b)] >= 0
+    return counts
+
+
+def _draw_density(board):
+    """Share of two-card holdings (in %) that have a flush or straight draw on `board`."""
+    deck = np.setdiff1d(np.arange(52), board)
+    holdings = np.array(list(itertools.combinations(deck, 2)))
+    cards = np.hstack([np.broadcast_to(board, (len(holdings), len(board))), holdings])
+
+    masks = _suit_masks(cards)
+    flush_draw = (_POPCOUNT[masks] == 4).any(axis=1)
+
+    ranks = np.bitwise_or.reduce(masks, axis=1)
+    made = _STRAIGHT[ranks] >= 0
+    outs = (_STRAIGHT[ranks[:, None] | (1 << np.arange(13))] >= 0).sum(axis=1)
+    straight_draw = ~made & (outs > 0)
+    return int(round(100 * np.mean(flush_draw | straight_draw)))
+
+
+def compute_features(boards, straight_combos=None):
+    """Feature table (N, len(FEATURES)) for an (N, k) array of card ints."""
+    if straight_combos is None:
+        straight_combos = _straight_combo_table()
+    n, k = boards.shape
+    suit_masks = _suit_masks(boards)
+    suit_counts = _POPCOUNT[suit_masks]
+    rank_counts = np.zeros((n, 13), dtype=np.int64)
+    for column in boards.T:
+        rank_counts[np.arange(n), column // 4] += 1
+    ranks = np.bitwise_or.reduce(suit_masks, axis=1)
+
+    max_rank_count = rank_counts.max(axis=1)
+    pairs = (rank_counts >= 2).sum(axis=1)
+    max_suit = suit_counts.max(axis=1)
+    suits = (suit_counts > 0).sum(axis=1)
+    flush_possible = max_suit >= 3
+    straight_made = _STRAIGHT[ranks] >= 0
+    combos = straight_combos[ranks]
+    connected = np.max([_POPCOUNT[ranks & w] for w in _WINDOWS], axis=0)
+
+    # A straight flush needs 3+ cards of one suit inside one 5-rank window
+    suited_window = np.max([_POPCOUNT[suit_masks & w].max(axis=1) for w in _WINDOWS], axis=0)
+    nut_class = np.full(n, 3)  # Trips (a set) is always possible
+    nut_class = np.where(combos > 0, 4, nut_class)
+    nut_class = np.where(flush_possible, 5, nut_class)
+    nut_class = np.where(max_rank_count >= 2, 7, nut_class)
+    nut_class = np.where(suited_window >= 3, 8, nut_class)
+
+    draw_density = np.zeros(n, dtype=np.int64)
+    if k < 5:
+        draw_density = np.array([_draw_density(board) for board in boards])
+
+    table = np.stack([max_rank_count, pairs, max_suit, suits, flush_possible, straight_made, combos,
+                      connected, nut_class, draw_density], axis=1)
+    return table.astype(np.uint8)
+
+
+def _canonical_keys(boards):
+    """One int per board that is equal exactly for suit-isomorphic boards."""
+    masks = -np.sort(-_suit_masks(boards), axis=1)
+    return (masks[:, 0] << 39) | (masks[:, 1] << 26) | (masks[:, 2] << 13) | masks[:, 3]
+
+
+def build(directory=DATA_DIR):
+    """Compute and save the index for every street. Returns {street: canonical board count}."""
+    os.makedirs(directory, exist_ok=True)
+    straight_combos = _straight_combo_table()
+    sizes = {}
+    boards = np.array(list(itertools.combinations(range(52), 3)), dtype=np.int64)
+    for k in (3, 4, 5):
+        if k > 3:
+            # Extend every board of the previous street by one higher card
+            extended = []
+            for card in range(52):
+                below = boards[boards[:, -1] < card]
+                extended.append(np.hstack([below, np.full((len(below), 1), card)]))
+            boards = np.vstack(extended)
+        keys = _canonical_keys(boards)
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        features = compute_features(boards[first], straight_combos)
+
+        rows = np.zeros(comb(52, k), dtype=np.uint32)
+        rows[_colex_ranks(boards)] = inverse.ravel()
+        np.save(os.path.join(directory, f"{STREETS[k]}_rows.npy"), rows)
+        np.save(os.path.join(directory, f"{STREETS[k]}_features.npy"), features)
+        sizes[STREETS[k]] = len(first)
+    return sizes
+
+
+class BoardTextureIndex:
+    """Memory-mapped texture tables with O(1) lookup from communityCards."""
+
+    def __init__(self, directory=DATA_DIR):
+        self.directory = directory
+        self._tables = {}
+
+    def _table(self, k):
+        if k not in self._tables:
+            name = STREETS[k]
+            rows_path = os.path.join(self.directory, f"{name}_rows.npy")
+            if not os.path.exists(rows_path):
+                raise FileNotFoundError(f"No board texture index in {self.directory}; "
+                                        "build it first with `python -m pokerbot.texture`")
+            features = np.load(os.path.join(self.directory, f"{name}_features.npy"), mmap_mode="r")
+            self._tables[k] = (np.load(rows_path, mmap_mode="r"), features)
+        return self._tables[k]
+
+    def lookup(self, community_cards):
+        """Texture features of the board as a dict, or None before the flop."""
+        if len(community_cards) not in STREETS:
+            return None
+        rows, features = self._table(len(community_cards))
+        row = features[rows[colex_rank(card_indices(community_cards))]]
+        return dict(zip(FEATURES, (int(value) for value in row)))
+
+
+_shared_index = None
+
+
+def board_texture(community_cards):
+    """Texture of `community_cards` from a process-wide shared index."""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = BoardTextureIndex()
+    return _shared_index.lookup(community_cards)
+
+
+if __name__ == "__main__":
+    for street, count in build().items():
+        print(f"[INFO] {street}: {count} canonical boards")
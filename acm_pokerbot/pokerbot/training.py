@@ -0,0 +1,222 @@
+"""
+Self-play training for the learned policy in pokerbot/model.py.
+
+Every iteration plays one hand on each of many tables at once (2 to 6
+seats, every seat the same network). All tables advance together through
+engine.HeadlessTable.hand_steps: whenever they are all waiting on a seat,
+the equity estimates and the network are run once for the whole batch.
+
+The network is then updated with an actor-critic policy gradient: each
+decision's action is reinforced by how much better the hand ended for
+that seat than the value head expected, with an entropy bonus to keep
+exploring, and the value head regresses onto the hand results. The
+gradients are written out by hand in NumPy and applied with Adam.
+
+Usage:
+    python -m pokerbot.training --iterations 300 --tables 512
+then measure it with
+    python -m pokerbot.evaluation --hero strat_learned --opponents strat_AandY
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from pokerbot.batch_eval import card_indices
+from pokerbot.engine import HeadlessTable, shuffled_deck
+from pokerbot.model import (ACTIONS, FEATURES, MODEL_PATH, PolicyValueNet, batch_equity, features, legal_mask,
+                            to_move, update_aggression)
+from pokerbot.strategies.strat_AandY import PokerStrategy
+
+
+class SelfPlay:
+    def __init__(self, net, tables=512, seats=(2, 3, 4, 5, 6), starting_stack=1000, big_blind=10, samples=32,
+                 seed=None):
+        """
+        :param tables: Hands played per iteration, one per table.
+        :param seats: Table sizes, assigned to tables in turn.
+        :param samples: Random opponent hands per equity estimate.
+        """
+        self.net = net
+        self.starting_stack = starting_stack
+        self.samples = samples
+        self.engine = HeadlessTable([], starting_stack=starting_stack, small_blind=big_blind // 2,
+                                    big_blind=big_blind)
+        self.sizes = [seats[t % len(seats)] for t in range(tables)]
+        self.buttons = [0] * tables
+        self.aggression = [[0.5] * n for n in self.sizes]
+        self.rng = np.random.default_rng(seed)
+        self.rules = PokerStrategy()  # For calculate_pot_odds, so features match live play
+
+    def _advance(self, hands, t, move, waiting, results):
+        """Run table `t` until a seat has to act (recorded in `waiting`) or the hand ends."""
+        try:
+            step = hands[t].send(move)
+            while step[0] != "act":
+                step = hands[t].send(None)
+            waiting[t] = (step[1], step[2])
+        except StopIteration as stop:
+            waiting.pop(t, None)
+            results[t] = stop.value
+
+    def play(self):
+        """
+        Play one hand on every table. Returns the decisions as arrays (x, masks,
+        actions, rewards) with rewards in starting stacks, plus counts.
+        """
+        n_tables = len(self.sizes)
+        hands = []
+        for t, n in enumerate(self.sizes):
+            deck = shuffled_deck(int(self.rng.integers(1 << 62)))
+            hands.append(self.engine.hand_steps(deck, self.buttons[t], [self.starting_stack] * n))
+        waiting, results = {}, [None] * n_tables
+        for t in range(n_tables):
+            self._advance(hands, t, None, waiting, results)
+
+        rows_x, rows_mask, rows_action, rows_owner = [], [], [], []
+        while waiting:
+            batch = list(waiting.items())
+            states = [game_state for _, (_, game_state) in batch]
+            equity = batch_equity([card_indices(s["holeCards"]) for s in states],
+                                  [card_indices(s["communityCards"]) for s in states],
+                                  samples=self.samples, rng=self.rng,
+                                  opponents=[s["activeOpponents"] for s in states])
+            x = np.zeros((len(batch), len(FEATURES)))
+            masks = np.zeros((len(batch), len(ACTIONS)), dtype=bool)
+            for i, (t, (seat, game_state)) in enumerate(batch):
+                pot_odds = self.rules.calculate_pot_odds(game_state["pot"], game_state["currentBet"])
+                features(game_state, equity[i], pot_odds, game_state["position"], game_state["activeOpponents"],
+                         self.aggression[t][seat], out=x[i])
+                masks[i] = legal_mask(game_state["availableActions"])
+
+            probs, _ = self.net.predict(x, masks)
+            cumulative = probs.cumsum(axis=1)
+            actions = (cumulative < self.rng.random((len(batch), 1)) * cumulative[:, -1:]).sum(axis=1)
+            actions = np.minimum(actions, len(ACTIONS) - 1)
+
+            rows_x.append(x)
+            rows_mask.append(masks)
+            rows_action.append(actions)
+            for i, (t, (seat, game_state)) in enumerate(batch):
+                rows_owner.append((t, seat))
+                self.aggression[t][seat] = update_aggression(self.aggression[t][seat], game_state)
+                self._advance(hands, t, to_move(int(actions[i]), game_state), waiting, results)
+
+        for t in range(n_tables):
+            self.buttons[t] = (self.buttons[t] + 1) % self.sizes[t]
+        rewards = np.array([results[t]["net"][seat] for t, seat in rows_owner]) / self.starting_stack
+        return {
+            "x": np.vstack(rows_x),
+            "masks": np.vstack(rows_mask),
+            "actions": np.concatenate(rows_action),
+            "rewards": rewards,
+            "hands": n_tables,
+            "misacts": sum(sum(result["misacts"]) for result in results),
+        }
+
+
+class Trainer:
+    def __init__(self, net, learning_rate=1e-3, entropy_bonus=0.01, value_weight=0.5):
+        self.net = net
+        self.learning_rate = learning_rate
+        self.entropy_bonus = entropy_bonus
+        self.value_weight = value_weight
+        self.steps = 0
+        self._m = {name: np.zeros_like(w) for name, w in net.weights.items()}
+        self._v = {name: np.zeros_like(w) for name, w in net.weights.items()}
+
+    def gradients(self, batch):
+        """Loss gradients for every weight, plus the loss terms for reporting."""
+        w = self.net.weights
+        x, masks, actions, rewards = batch["x"], batch["masks"], batch["actions"], batch["rewards"]
+        n = len(x)
+        probs, values, hidden = self.net.forward(x, masks)
+
+        advantage = rewards - values
+        advantage = (advantage - advantage.mean()) / (advantage.std() + 1e-8)
+        chosen = np.zeros_like(probs)
+        chosen[np.arange(n), actions] = 1
+        log_probs = np.log(np.where(masks, probs, 1.0))
+        entropy = -(probs * log_probs).sum(axis=1)
+
+        # loss = -advantage * log p(action) - bonus * entropy + weight * (value - reward)^2
+        d_logits = (-advantage[:, None] * (chosen - probs)
+                    + self.entropy_bonus * probs * (log_probs + entropy[:, None])) / n
+        d_values = 2 * self.value_weight * (values - rewards) / n
+        d_hidden = d_logits @ w["Wp"].T + d_values[:, None] * w["Wv"][None, :]
+        d_hidden[hidden <= 0] = 0
+
+        grads = {
+            "W1": x.T @ d_hidden,
+            "b1": d_hidden.sum(axis=0),
+            "Wp": hidden.T @ d_logits,
+            "bp": d_logits.sum(axis=0),
+            "Wv": hidden.T @ d_values,
+            "bv": np.asarray(d_values.sum()),
+        }
+        stats = {
+            "value_loss": float(np.mean((values - rewards) ** 2)),
+            "entropy": float(entropy.mean()),
+            "policy": np.bincount(actions, minlength=len(ACTIONS)) / n,
+        }
+        return grads, stats
+
+    def update(self, batch, beta1=0.9, beta2=0.999):
+        """One Adam step on `batch`. Returns the loss terms before the step."""
+        grads, stats = self.gradients(batch)
+        self.steps += 1
+        for name, grad in grads.items():
+            self._m[name] = beta1 * self._m[name] + (1 - beta1) * grad
+            self._v[name] = beta2 * self._v[name] + (1 - beta2) * grad ** 2
+            m = self._m[name] / (1 - beta1 ** self.steps)
+            v = self._v[name] / (1 - beta2 ** self.steps)
+            self.net.weights[name] -= self.learning_rate * m / (np.sqrt(v) + 1e-8)
+        return stats
+
+
+def train(net, iterations=300, tables=512, learning_rate=1e-3, entropy_bonus=0.01, samples=32, seed=None,
+          out=MODEL_PATH, save_every=10):
+    """Run self-play and training for `iterations` rounds, saving the weights to `out` as we go."""
+    play = SelfPlay(net, tables=tables, samples=samples, seed=seed)
+    trainer = Trainer(net, learning_rate=learning_rate, entropy_bonus=entropy_bonus)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    print(f"{'iter':>5} {'decisions':>9} {'dec/s':>7} {'value loss':>10} {'entropy':>7}  "
+          + " ".join(f"{action:>10}" for action in ACTIONS))
+    for iteration in range(1, iterations + 1):
+        start = time.perf_counter()
+        batch = play.play()
+        elapsed = time.perf_counter() - start
+        stats = trainer.update(batch)
+        print(f"{iteration:>5} {len(batch['x']):>9} {len(batch['x']) / elapsed:>7.0f} "
+              f"{stats['value_loss']:>10.4f} {stats['entropy']:>7.3f}  "
+              + " ".join(f"{share:>10.1%}" for share in stats["policy"]))
+        if iteration % save_every == 0 or iteration == iterations:
+            net.save(out)
+    print(f"\n[INFO] Saved weights to {out}")
+    return net
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the learned strategy by self-play.")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--tables", type=int, default=512, help="Hands played per iteration")
+    parser.add_argument("--hidden", type=int, default=64, help="Hidden units for a new network")
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--entropy", type=float, default=0.01, help="Entropy bonus")
+    parser.add_argument("--samples", type=int, default=32, help="Equity samples per decision")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=MODEL_PATH, help="Where to save the weights")
+    parser.add_argument("--resume", action="store_true", help="Continue from the weights at --out")
+    args = parser.parse_args()
+
+    if args.resume and os.path.exists(args.out):
+        net = PolicyValueNet.load(args.out)
+    else:
+        net = PolicyValueNet.initialize(hidden=args.hidden, seed=args.seed)
+    train(net, iterations=args.iterations, tables=args.tables, learning_rate=args.learning_rate,
+          entropy_bonus=args.entropy, samples=args.samples, seed=args.seed, out=args.out)
+
+
+if __name__ == "__main__":
+    main()